@@ -384,6 +384,8 @@ Active Entries: {len(self.context_entries)}
         
         # Store in TimescaleDB based on event type
         if self.timeseries_db:
+            # All rows written for one event share a single timestamp
+            timestamp = datetime.now(timezone.utc)
             try:
                 if event_type == 'metric_threshold':
                     # Store as metric
@@ -391,7 +393,7 @@ Active Entries: {len(self.context_entries)}
                     value = event.get('value', 0)
                     self.timeseries_db.store_metrics(hostname, {
                         metric_name: {'value': value, 'unit': ''}
-                    })
+                    }, timestamp=timestamp)
                 
                 elif event_type == 'log_pattern':
                     # Store as log event
@@ -399,7 +401,7 @@ Active Entries: {len(self.context_entries)}
                     message = event.get('message', '')
                     unit = event.get('unit', '')
                     self.timeseries_db.store_log_event(
-                        hostname, severity, message, unit
+                        hostname, severity, message, unit, timestamp=timestamp
                     )
                 
                 # Always store as trigger event
@@ -407,7 +409,8 @@ Active Entries: {len(self.context_entries)}
                     hostname,
                     event_type,
                     event.get('message', ''),
-                    metadata={'source': source, 'event': event}
+                    metadata={'source': source, 'event': event},
+                    timestamp=timestamp
                 )
             except Exception as e:
                 print(f"Error storing event in TimescaleDB: {e}")
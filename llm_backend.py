@@ -8,6 +8,7 @@ Provides a unified interface for different LLM backends:
 """
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 import requests
 from openai import OpenAI
@@ -49,6 +50,39 @@ class LLMBackend(ABC):
         """Check if the backend is available and responding"""
         pass
 
+    def generate_batch(
+        self,
+        prompts: List[str],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        max_concurrency: int = 4,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate text for several prompts at once
+        
+        Requests are issued concurrently so the server can batch them
+        (llama.cpp continuous batching) instead of serving one at a time.
+        
+        Returns:
+            Responses in the same order as prompts
+        """
+        def generate_one(prompt: str) -> str:
+            return self.generate(
+                prompt,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        
+        if len(prompts) <= 1:
+            return [generate_one(prompt) for prompt in prompts]
+        
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(prompts))) as pool:
+            return list(pool.map(generate_one, prompts))
+
 
 class LlamaCppBackend(LLMBackend):
     """Backend for llama.cpp with OpenAI-compatible API"""
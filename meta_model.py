@@ -708,8 +708,7 @@ Provide unified summary (max 800 chars) covering all key points."""
             return self._query_llm(prompt, temperature)
         
         # Ensure system message is present with tool descriptions
-        tool_definitions = self.tools.get_tool_definitions()
-        tools_description = "\n\nAvailable tools:\n" + json.dumps(tool_definitions, indent=2)
+        tools_description = "\n\nAvailable tools:\n" + self.tools.get_tool_definitions_json()
         
         system_msg = self.SYSTEM_PROMPT + f"\n\nYou have access to system administration tools. {tools_description}\n\nTo use a tool, respond ONLY with a JSON object in this format:\n{{\"tool\": \"tool_name\", \"arguments\": {{\"arg1\": \"value1\"}}}}\n\nAfter you receive the tool output, continue your analysis. When you have a final answer, provide it as regular text."
         
@@ -751,8 +750,10 @@ Provide unified summary (max 800 chars) covering all key points."""
                         
                         print(f"  → Tool call: {function_name}({arguments})")
                         
-                        # Execute the tool
-                        tool_result = self.tools.execute_tool(function_name, arguments)
+                        # Execute the tool (serialized once, straight to JSON)
+                        tool_result = self.tools.execute_tool(
+                            function_name, arguments, serialize=True
+                        ).decode('utf-8')
                         
                         # Process result
                         processed_result = self._process_tool_result_hierarchical(function_name, tool_result)
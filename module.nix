@@ -21,10 +21,15 @@ let
     tiktoken
     fastapi
     uvicorn
+    uvloop
+    httptools
     websockets
     openai
     mcp
     sse-starlette
+    orjson
+    dasbus
+    msgpack
   ]);
 
   # Model Downloader Script
@@ -358,6 +363,13 @@ in {
         example = [ "localhost" "*.coven.systems" ];
         description = "Allowed hostnames for web access";
       };
+
+      corsOrigins = mkOption {
+        type = types.listOf types.str;
+        default = [ ];
+        example = [ "https://dashboard.example.com" ];
+        description = "Extra origins allowed to call the web API cross-origin";
+      };
     };
 
     # === MCP SERVER OPTIONS ===
@@ -620,6 +632,7 @@ in {
       environment = {
         PYTHONPATH = toString ./.;
         PORT = toString cfg.webInterface.port;
+        CORS_ORIGINS = concatStringsSep "," cfg.webInterface.corsOrigins;
         CHROMA_ENV_FILE = "";
         ANONYMIZED_TELEMETRY = "False";
       };
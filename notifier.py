@@ -32,6 +32,8 @@ class GotifyNotifier:
         self.gotify_url = gotify_url or os.environ.get("GOTIFY_URL", "")
         self.gotify_token = gotify_token or os.environ.get("GOTIFY_TOKEN", "")
         self.enabled = bool(self.gotify_url and self.gotify_token)
+        # Reused across sends so the HTTP connection is kept alive
+        self.session = requests.Session()
         
     def send(
         self,
@@ -71,7 +73,7 @@ class GotifyNotifier:
             if extras:
                 data["extras"] = extras
             
-            response = requests.post(
+            response = self.session.post(
                 url,
                 json=data,
                 headers=headers,
@@ -0,0 +1,246 @@
+let ws = null;
+let status = null;
+
+function updateUI(data) {
+    // Status badge
+    const statusBadge = document.getElementById('status-badge');
+    statusBadge.textContent = data.status.toUpperCase();
+    statusBadge.className = 'status-indicator status-' + data.status;
+
+    // Header info
+    document.getElementById('hostname').textContent = data.hostname;
+    document.getElementById('update-time').textContent = new Date().toLocaleTimeString();
+
+    // Metrics
+    const metrics = data.metrics;
+
+    updateMetric('cpu', metrics.cpu_percent);
+    updateMetric('memory', metrics.memory_percent);
+    updateMetric('disk', metrics.disk_percent);
+
+    document.getElementById('health-score').textContent = data.health_score + '/100';
+    document.getElementById('load-avg').textContent = metrics.load_average['1min'].toFixed(2);
+    document.getElementById('failed-services').textContent = data.failed_services.length;
+}
+
+function updateMetric(name, percent) {
+    const valueEl = document.getElementById(name + '-value');
+    const barEl = document.getElementById(name + '-bar');
+
+    valueEl.textContent = percent.toFixed(1) + '%';
+    barEl.style.width = percent + '%';
+
+    // Color based on threshold
+    barEl.className = 'metric-bar-fill';
+    if (percent > 90) {
+        barEl.classList.add('critical');
+    } else if (percent > 75) {
+        barEl.classList.add('warning');
+    }
+}
+
+async function fetchSummary() {
+    try {
+        const response = await fetch('/api/summary');
+        const data = await response.json();
+
+        const eventList = document.getElementById('event-list');
+        eventList.innerHTML = '';
+
+        if (data.recent_events && data.recent_events.length > 0) {
+            data.recent_events.forEach(event => {
+                const li = document.createElement('li');
+                li.className = 'event-item ' + (event.severity || 'info');
+                li.innerHTML = `
+                    <div style="font-weight: 500;">${event.message}</div>
+                    <div class="event-time">${new Date(event.timestamp).toLocaleString()} • ${event.type}</div>
+                `;
+                eventList.appendChild(li);
+            });
+        } else {
+            eventList.innerHTML = '<li class="loading">No recent activity</li>';
+        }
+    } catch (error) {
+        console.error('Error fetching summary:', error);
+    }
+}
+
+async function fetchDecisions() {
+    try {
+        const response = await fetch('/api/decisions?limit=1');
+        const data = await response.json();
+
+        const container = document.getElementById('ai-analysis-container');
+
+        if (data.decisions && data.decisions.length > 0) {
+            const decision = data.decisions[0];
+            const analysis = decision.analysis;
+
+            let issuesHtml = '';
+            if (analysis.issues && analysis.issues.length > 0) {
+                issuesHtml = analysis.issues.map(issue => 
+                    `<span class="issue-tag issue-${issue.severity}">${issue.severity.toUpperCase()}: ${issue.description}</span>`
+                ).join('');
+            }
+
+            container.innerHTML = `
+                <div class="decision-card">
+                    <div class="decision-header">
+                        <div>
+                            <h2 style="color: #a78bfa; margin-bottom: 5px;">🧠 Latest AI Analysis</h2>
+                            <div class="event-time">Generated at ${new Date(decision.timestamp).toLocaleString()}</div>
+                        </div>
+                        <span class="status-indicator status-${analysis.status}">${analysis.status.toUpperCase()}</span>
+                    </div>
+
+                    <p style="margin-bottom: 15px; line-height: 1.5;">${analysis.summary}</p>
+
+                    <div style="margin-bottom: 15px;">
+                        ${issuesHtml}
+                    </div>
+
+                    <div class="action-box">
+                        <strong style="color: #60a5fa; font-size: 0.9rem;">RECOMENDED ACTIONS:</strong>
+                        <p style="margin-top: 5px; font-size: 0.95rem;">${decision.action.proposed_action || 'No immediate actions required.'}</p>
+                    </div>
+                </div>
+            `;
+        }
+    } catch (error) {
+        console.error('Error fetching decisions:', error);
+    }
+}
+
+// Minimal MessagePack decoder for the status frames sent over the WebSocket
+function decodeMsgpack(buffer) {
+    const view = new DataView(buffer);
+    const bytes = new Uint8Array(buffer);
+    const utf8 = new TextDecoder();
+    let pos = 0;
+
+    function str(length) {
+        const value = utf8.decode(bytes.subarray(pos, pos + length));
+        pos += length;
+        return value;
+    }
+
+    function array(length) {
+        const value = new Array(length);
+        for (let i = 0; i < length; i++) {
+            value[i] = read();
+        }
+        return value;
+    }
+
+    function map(length) {
+        const value = {};
+        for (let i = 0; i < length; i++) {
+            const key = read();
+            value[key] = read();
+        }
+        return value;
+    }
+
+    function uint(size) {
+        let value;
+        if (size === 1) value = view.getUint8(pos);
+        else if (size === 2) value = view.getUint16(pos);
+        else if (size === 4) value = view.getUint32(pos);
+        else value = Number(view.getBigUint64(pos));
+        pos += size;
+        return value;
+    }
+
+    function int(size) {
+        let value;
+        if (size === 1) value = view.getInt8(pos);
+        else if (size === 2) value = view.getInt16(pos);
+        else if (size === 4) value = view.getInt32(pos);
+        else value = Number(view.getBigInt64(pos));
+        pos += size;
+        return value;
+    }
+
+    function read() {
+        const type = bytes[pos++];
+
+        if (type <= 0x7f) return type;
+        if (type >= 0xe0) return type - 0x100;
+        if ((type & 0xf0) === 0x80) return map(type & 0x0f);
+        if ((type & 0xf0) === 0x90) return array(type & 0x0f);
+        if ((type & 0xe0) === 0xa0) return str(type & 0x1f);
+
+        let value;
+        switch (type) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xca: value = view.getFloat32(pos); pos += 4; return value;
+            case 0xcb: value = view.getFloat64(pos); pos += 8; return value;
+            case 0xcc: return uint(1);
+            case 0xcd: return uint(2);
+            case 0xce: return uint(4);
+            case 0xcf: return uint(8);
+            case 0xd0: return int(1);
+            case 0xd1: return int(2);
+            case 0xd2: return int(4);
+            case 0xd3: return int(8);
+            case 0xd9: return str(uint(1));
+            case 0xda: return str(uint(2));
+            case 0xdb: return str(uint(4));
+            case 0xdc: return array(uint(2));
+            case 0xdd: return array(uint(4));
+            case 0xde: return map(uint(2));
+            case 0xdf: return map(uint(4));
+            default: throw new Error('Unsupported MessagePack type 0x' + type.toString(16));
+        }
+    }
+
+    return read();
+}
+
+function applyMergePatch(target, patch) {
+    // JSON merge patch (RFC 7386): objects merge key by key, null deletes
+    for (const [key, value] of Object.entries(patch)) {
+        if (value === null) {
+            delete target[key];
+        } else if (typeof value === 'object' && !Array.isArray(value) &&
+                   typeof target[key] === 'object' && target[key] !== null && !Array.isArray(target[key])) {
+            applyMergePatch(target[key], value);
+        } else {
+            target[key] = value;
+        }
+    }
+    return target;
+}
+
+function connectWebSocket() {
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    ws = new WebSocket(protocol + '//' + window.location.host + '/ws');
+
+    ws.binaryType = 'arraybuffer';
+
+    ws.onmessage = function(event) {
+        // Binary frames are MessagePack; the server falls back to JSON text
+        const frame = typeof event.data === 'string' ? JSON.parse(event.data) : decodeMsgpack(event.data);
+        // The server sends a full status first, then patches against the last one
+        status = frame.type === 'patch' ? applyMergePatch(status, frame.data) : frame.data;
+        updateUI(status);
+    };
+
+    ws.onclose = function() {
+        console.log('WebSocket closed, reconnecting in 5s...');
+        setTimeout(connectWebSocket, 5000);
+    };
+
+    ws.onerror = function(error) {
+        console.error('WebSocket error:', error);
+    };
+}
+
+// Initialize
+connectWebSocket();
+fetchSummary();
+fetchDecisions();
+setInterval(fetchSummary, 15000);  // Update summary every 15s
+setInterval(fetchDecisions, 600000); // Update AI analysis every 10m
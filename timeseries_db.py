@@ -7,7 +7,7 @@ import os
 import pwd
 import psycopg2
 from psycopg2.extras import execute_values
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 import json
 
@@ -15,6 +15,9 @@ import json
 class TimeSeriesDB:
     """Manage time-series metrics in TimescaleDB (PostgreSQL extension)"""
     
+    # Bucket width of the system_metrics_5m continuous aggregate
+    AGGREGATE_INTERVAL = "5 minutes"
+    
     def __init__(
         self,
         host: str = "localhost",
@@ -47,6 +50,7 @@ class TimeSeriesDB:
             "password": password
         }
         self._ensure_schema()
+        self.has_metrics_aggregate = self._ensure_metrics_aggregate()
     
     def _get_connection(self):
         """Get database connection"""
@@ -154,6 +158,51 @@ class TimeSeriesDB:
                 
                 conn.commit()
     
+    def _ensure_metrics_aggregate(self) -> bool:
+        """
+        Create the 5-minute continuous aggregate over system_metrics
+        
+        Returns:
+            False if this TimescaleDB build has no continuous aggregates
+            (Apache-only builds), in which case queries use the raw table
+        """
+        try:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    # Real-time aggregation: buckets not yet materialized are
+                    # computed from the raw rows at query time
+                    cur.execute("""
+                        CREATE MATERIALIZED VIEW IF NOT EXISTS system_metrics_5m
+                        WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+                        SELECT
+                            time_bucket(INTERVAL '5 minutes', time) AS bucket,
+                            hostname,
+                            metric_name,
+                            unit,
+                            AVG(value) AS avg_value,
+                            MAX(value) AS max_value,
+                            MIN(value) AS min_value
+                        FROM system_metrics
+                        GROUP BY bucket, hostname, metric_name, unit
+                        WITH NO DATA;
+                    """)
+                    
+                    # Refreshes only recompute invalidated ranges, so covering
+                    # the whole table stays cheap and backfills old rows
+                    cur.execute("""
+                        SELECT add_continuous_aggregate_policy('system_metrics_5m',
+                            start_offset => NULL,
+                            end_offset => INTERVAL '5 minutes',
+                            schedule_interval => INTERVAL '5 minutes',
+                            if_not_exists => TRUE);
+                    """)
+                    
+                    conn.commit()
+            return True
+        except psycopg2.Error as e:
+            print(f"Continuous aggregate unavailable, querying raw metrics: {e}")
+            return False
+    
     def store_metrics(self, hostname: str, metrics: Dict[str, Any], timestamp: datetime = None):
         """Store system metrics"""
         if timestamp is None:
@@ -265,22 +314,36 @@ class TimeSeriesDB:
                 )
                 conn.commit()
     
-    def query_metrics(self, hostname: str, metric_names: List[str] = None,
-                     start_time: datetime = None, end_time: datetime = None,
-                     interval: str = "5 minutes") -> List[Dict[str, Any]]:
-        """Query metrics with optional time bucketing"""
+    def _metrics_query(self, hostname: str, metric_names: Optional[List[str]],
+                       start_time: Optional[datetime], end_time: Optional[datetime],
+                       interval: str) -> Tuple[str, List[Any]]:
+        """Build the time-bucketed metrics query and its parameters"""
+        now = datetime.now(timezone.utc)
         if start_time is None:
-            start_time = datetime.now(timezone.utc) - timedelta(hours=1)
+            start_time = now - timedelta(hours=1)
         if end_time is None:
-            end_time = datetime.now(timezone.utc)
+            end_time = now
         
-        where_clauses = ["hostname = %s", "time >= %s", "time <= %s"]
+        # The continuous aggregate already holds these buckets
+        use_aggregate = self.has_metrics_aggregate and interval == self.AGGREGATE_INTERVAL
+        time_column = "bucket" if use_aggregate else "time"
+        
+        where_clauses = ["hostname = %s", f"{time_column} >= %s", f"{time_column} <= %s"]
         params = [hostname, start_time, end_time]
         
         if metric_names:
             where_clauses.append("metric_name = ANY(%s)")
             params.append(metric_names)
         
+        if use_aggregate:
+            query = f"""
+                SELECT bucket, metric_name, avg_value, max_value, min_value, unit
+                FROM system_metrics_5m
+                WHERE {' AND '.join(where_clauses)}
+                ORDER BY bucket DESC, metric_name
+            """
+            return query, params
+        
         query = f"""
             SELECT 
                 time_bucket(%s, time) AS bucket,
@@ -294,21 +357,54 @@ class TimeSeriesDB:
             GROUP BY bucket, metric_name, unit
             ORDER BY bucket DESC, metric_name
         """
+        return query, [interval] + params
+    
+    @staticmethod
+    def _metric_row(row: tuple) -> Dict[str, Any]:
+        """Convert a bucketed metrics row to a dict"""
+        return {
+            'time': row[0],
+            'metric_name': row[1],
+            'avg_value': row[2],
+            'max_value': row[3],
+            'min_value': row[4],
+            'unit': row[5]
+        }
+    
+    def query_metrics(self, hostname: str, metric_names: List[str] = None,
+                     start_time: datetime = None, end_time: datetime = None,
+                     interval: str = "5 minutes") -> List[Dict[str, Any]]:
+        """Query metrics with optional time bucketing"""
+        query, params = self._metrics_query(hostname, metric_names, start_time, end_time, interval)
         
         with self._get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(query, [interval] + params)
-                results = []
-                for row in cur.fetchall():
-                    results.append({
-                        'time': row[0],
-                        'metric_name': row[1],
-                        'avg_value': row[2],
-                        'max_value': row[3],
-                        'min_value': row[4],
-                        'unit': row[5]
-                    })
-                return results
+                cur.execute(query, params)
+                return [self._metric_row(row) for row in cur.fetchall()]
+    
+    def iter_metrics(self, hostname: str, metric_names: List[str] = None,
+                     start_time: datetime = None, end_time: datetime = None,
+                     interval: str = "5 minutes", batch_size: int = 1024) -> Iterator[Dict[str, Any]]:
+        """
+        Like query_metrics, but yield rows as they are fetched
+        
+        Uses a server-side cursor, so memory stays bounded by batch_size
+        however long the requested period is.
+        """
+        query, params = self._metrics_query(hostname, metric_names, start_time, end_time, interval)
+        
+        conn = self._get_connection()
+        try:
+            with conn.cursor(name="iter_metrics") as cur:
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield self._metric_row(row)
+        finally:
+            conn.close()
     
     def query_latest_metrics(self, hostname: str, metric_names: List[str] = None) -> Dict[str, Any]:
         """Get the most recent value for each metric"""
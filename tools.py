@@ -5,15 +5,760 @@ Tool Definitions - Functions that the AI can call to interact with the system
 
 import subprocess
 import json
+import http.client
 import os
-from typing import Dict, Any, List, Optional
+import pwd
+import grp
+import re
+import shlex
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple, Union
 from pathlib import Path
+from urllib.parse import urlsplit
 from command_patterns import transform_ssh_command
+from notifier import GotifyNotifier
+
+# Optional fast JSON encoder for tool results (same drop-in idea as FastAPI's
+# ORJSONResponse); falls back to the stdlib encoder when not installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Directories whose binaries may be invoked by absolute path in safe mode
+_SYSTEM_BIN_DIRS = frozenset({
+    '/run/current-system/sw/bin',
+    '/run/wrappers/bin',
+    '/bin',
+    '/usr/bin',
+    '/usr/sbin',
+})
+_NIX_STORE_BIN_DIR = re.compile(r'/nix/store/[0-9a-z]{32}-[^/]+/s?bin')
+
+# Commands after which cached hardware info is stale
+_REBUILD_MARKERS = ('nixos-rebuild', 'nh os')
+
+# Seconds to wait for nix-shell to realise a tool's package; a tool call is
+# interactive, so an uncached package that needs a long build is given up on
+NIX_RESOLVE_TIMEOUT = 60
+
+
+# Anything here needs a real shell (pipes, redirects, expansion, globbing...)
+_SHELL_SYNTAX = re.compile(r'[|&;<>()$`\\*?\[\]{}~#!\n]')
+
+
+def _simple_argv(command: str) -> Optional[List[str]]:
+    """
+    Split a command into argv if it can run without a shell
+    
+    Returns None when the command uses shell syntax, starts with a variable
+    assignment, or names something that is not an executable on PATH
+    (e.g. a shell builtin).
+    """
+    if _SHELL_SYNTAX.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or '=' in argv[0] or shutil.which(argv[0]) is None:
+        return None
+    return argv
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a tool result to UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=str).encode('utf-8')
+
+
+def _batch_read_sysfs(paths: List[str], max_bytes: int = 4096) -> Dict[str, str]:
+    """
+    Read a batch of small sysfs/procfs attribute files.
+    
+    Uses raw file descriptors (open/read/close, no Python buffering or
+    text layer), which is all a few-byte kernel attribute needs.
+    Unreadable paths are omitted from the result.
+    """
+    values = {}
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            values[path] = os.read(fd, max_bytes).decode('utf-8', errors='replace')
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    return values
+
+
+def _human_size(size: int) -> str:
+    """Format a byte count like `ls -h` (e.g. 512, 4.0K, 12M)"""
+    for unit in ('', 'K', 'M', 'G', 'T'):
+        if size < 1024 or unit == 'T':
+            if not unit:
+                return str(size)
+            return f"{size:.1f}{unit}" if size < 10 else f"{size:.0f}{unit}"
+        size /= 1024
+    return str(size)
+
+
+@lru_cache(maxsize=None)
+def _user_name(uid: int) -> str:
+    """Get the user name for a uid, or the uid itself if it has none"""
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@lru_cache(maxsize=None)
+def _group_name(gid: int) -> str:
+    """Get the group name for a gid, or the gid itself if it has none"""
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
+
+def _ls_row(path: str, name: str, st: os.stat_result) -> str:
+    """Format one entry like a line of `ls -lh`"""
+    modified = datetime.fromtimestamp(st.st_mtime).strftime('%b %d %H:%M')
+    if stat.S_ISLNK(st.st_mode):
+        try:
+            name += f" -> {os.readlink(path)}"
+        except OSError:
+            pass
+    return (
+        f"{stat.filemode(st.st_mode)} {st.st_nlink:>2} "
+        f"{_user_name(st.st_uid)} {_group_name(st.st_gid)} "
+        f"{_human_size(st.st_size):>5} {modified} {name}"
+    )
+
+
+def _close_fds(fds: Dict[str, int]):
+    """Close and forget every file descriptor in a path -> fd map"""
+    for fd in fds.values():
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+    fds.clear()
+
+
+# GPU driver names (uevent DRIVER= / hwmon chip prefix) and their vendor
+_GPU_SENSOR_CHIPS = (('amdgpu', 'amd'), ('radeon', 'amd'), ('nouveau', 'nvidia'), ('i915', 'intel'), ('xe', 'intel'))
+
+
+def _find_gpu_hwmons() -> List[Tuple[str, str, List[str], List[str]]]:
+    """
+    Locate every DRM card exposing hwmon sensors
+    
+    Returns:
+        [(device_path, vendor, temp_input_files, power_average_files)], with
+        vendor taken from the card's kernel driver (the driver name itself
+        when it is not a known GPU driver)
+    """
+    drm = "/sys/class/drm"
+    try:
+        with os.scandir(drm) as it:
+            cards = sorted(e.name for e in it if e.name.startswith('card') and '-' not in e.name)
+    except OSError:
+        return []
+    
+    vendors = dict(_GPU_SENSOR_CHIPS)
+    found = []
+    for card in cards:
+        device_path = f"{drm}/{card}/device"
+        try:
+            with os.scandir(f"{device_path}/hwmon") as it:
+                hwmons = sorted(e.path for e in it if e.name.startswith('hwmon'))
+        except OSError:
+            continue
+        
+        # One pass over each hwmon directory picks out every sensor file
+        temp_files, power_files = [], []
+        for hwmon in hwmons:
+            with os.scandir(hwmon) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith('temp') and name.endswith('_input'):
+                        temp_files.append(entry.path)
+                    elif name.startswith('power') and name.endswith('_average'):
+                        power_files.append(entry.path)
+        if not temp_files and not power_files:
+            continue
+        
+        uevent = _batch_read_sysfs([f"{device_path}/uevent"])
+        driver = next(
+            (line[len("DRIVER="):] for line in next(iter(uevent.values()), "").splitlines()
+             if line.startswith("DRIVER=")),
+            "unknown",
+        )
+        found.append((device_path, vendors.get(driver, driver), sorted(temp_files), sorted(power_files)))
+    
+    return found
+
+
+def _read_cpuinfo() -> Dict[str, Any]:
+    """Summarize /proc/cpuinfo (the lscpu essentials) without spawning lscpu"""
+    info: Dict[str, Any] = {"architecture": os.uname().machine}
+    logical = 0
+    cores = set()
+    sockets = set()
+    physical_id = None
+    for line in Path("/proc/cpuinfo").read_text(errors='replace').splitlines():
+        key, sep, value = line.partition(':')
+        if not sep:
+            continue
+        key, value = key.strip(), value.strip()
+        if key == "processor":
+            logical += 1
+        elif key == "physical id":
+            sockets.add(value)
+            physical_id = value
+        elif key == "core id":
+            cores.add((physical_id, value))
+        elif key in ("model name", "Hardware", "Model") and "model" not in info:
+            info["model"] = value
+        elif key == "vendor_id" and "vendor" not in info:
+            info["vendor"] = value
+        elif key == "flags" and "virtualization" not in info:
+            flags = value.split()
+            info["virtualization"] = "VT-x" if "vmx" in flags else "AMD-V" if "svm" in flags else None
+    info["logical_cpus"] = logical or os.cpu_count()
+    if cores:
+        info["physical_cores"] = len(cores)
+    if sockets:
+        info["sockets"] = len(sockets)
+    return info
+
+
+def _read_meminfo() -> Dict[str, int]:
+    """Parse /proc/meminfo into sizes in MiB (keys as in `free`)"""
+    kib = {}
+    for line in Path("/proc/meminfo").read_text().splitlines():
+        key, sep, value = line.partition(':')
+        if sep:
+            kib[key] = int(value.split()[0])
+    fields = {
+        "total_mb": "MemTotal",
+        "available_mb": "MemAvailable",
+        "free_mb": "MemFree",
+        "buffers_mb": "Buffers",
+        "cached_mb": "Cached",
+        "swap_total_mb": "SwapTotal",
+        "swap_free_mb": "SwapFree",
+    }
+    return {name: kib[key] // 1024 for name, key in fields.items() if key in kib}
+
+
+# Kernel and pseudo filesystems that df users never care about; everything
+# else (zfs datasets, btrfs subvolumes, network mounts) is reported
+_VIRTUAL_FSTYPES = frozenset({
+    'proc', 'sysfs', 'cgroup', 'cgroup2', 'devtmpfs', 'devpts', 'mqueue',
+    'hugetlbfs', 'debugfs', 'tracefs', 'securityfs', 'pstore', 'bpf',
+    'configfs', 'fusectl', 'efivarfs', 'autofs', 'binfmt_misc', 'rpc_pipefs',
+    'nsfs', 'selinuxfs', 'overlay', 'squashfs', 'ramfs', 'tmpfs',
+})
+
+
+def _read_mounts() -> List[Tuple[str, str, str]]:
+    """Get (source, mountpoint, fstype) for every entry in /proc/mounts"""
+    mounts = []
+    for line in Path("/proc/mounts").read_text().splitlines():
+        parts = line.split()
+        if len(parts) >= 3:
+            # Spaces in mount points are escaped as \040
+            mounts.append((parts[0], parts[1].replace('\\040', ' '), parts[2]))
+    return mounts
+
+
+def _list_block_devices() -> List[Dict[str, Any]]:
+    """List block devices and partitions from /sys/block (the lsblk essentials)"""
+    # Resolve /dev/mapper/* and /dev/disk/by-*/ links to the kernel name
+    # (dm-0, sda1) that /sys/block uses
+    mounts = {}
+    for source, mountpoint, fstype in _read_mounts():
+        if source.startswith('/dev/'):
+            name = os.path.basename(os.path.realpath(source))
+            mounts.setdefault(name, (mountpoint, fstype))
+    
+    devices = []
+    with os.scandir("/sys/block") as it:
+        names = sorted(entry.name for entry in it)
+    for name in names:
+        base = f"/sys/block/{name}"
+        attrs = _batch_read_sysfs([
+            f"{base}/size", f"{base}/removable",
+            f"{base}/queue/rotational", f"{base}/device/model",
+        ])
+        sectors = int(attrs.get(f"{base}/size", "0").strip() or 0)
+        if not sectors:
+            continue  # Unused loop/ram devices
+        
+        partitions = []
+        with os.scandir(base) as it:
+            part_names = sorted(e.name for e in it if e.name.startswith(name) and e.is_dir())
+        for part in part_names:
+            part_size = _batch_read_sysfs([f"{base}/{part}/size"]).get(f"{base}/{part}/size", "0")
+            mountpoint, fstype = mounts.get(part, (None, None))
+            partitions.append({
+                "name": part,
+                "size_gb": round(int(part_size.strip() or 0) * 512 / 1024**3, 1),
+                "mountpoint": mountpoint,
+                "fstype": fstype,
+            })
+        
+        mountpoint, fstype = mounts.get(name, (None, None))
+        devices.append({
+            "name": name,
+            "size_gb": round(sectors * 512 / 1024**3, 1),
+            "model": attrs.get(f"{base}/device/model", "").strip() or None,
+            "removable": attrs.get(f"{base}/removable", "0").strip() == "1",
+            "rotational": attrs.get(f"{base}/queue/rotational", "0").strip() == "1",
+            "mountpoint": mountpoint,
+            "fstype": fstype,
+            "partitions": partitions,
+        })
+    return devices
+
+
+def _list_gpus() -> List[Dict[str, Any]]:
+    """List display adapters from /sys/class/drm (driver and PCI id per card)"""
+    gpus = []
+    try:
+        with os.scandir("/sys/class/drm") as it:
+            cards = sorted(e.name for e in it if e.name.startswith('card') and '-' not in e.name)
+    except OSError:
+        return gpus
+    for card in cards:
+        uevent = _batch_read_sysfs([f"/sys/class/drm/{card}/device/uevent"])
+        fields = dict(
+            line.split('=', 1)
+            for line in next(iter(uevent.values()), "").splitlines()
+            if '=' in line
+        )
+        gpus.append({
+            "card": card,
+            "driver": fields.get("DRIVER"),
+            "pci_id": fields.get("PCI_ID"),
+            "pci_slot": fields.get("PCI_SLOT_NAME"),
+        })
+    return gpus
+
+
+def _read_dmi() -> Dict[str, str]:
+    """Read motherboard/system identification from /sys/class/dmi/id"""
+    keys = ("board_vendor", "board_name", "sys_vendor", "product_name", "bios_version")
+    values = _batch_read_sysfs([f"/sys/class/dmi/id/{key}" for key in keys])
+    return {
+        key: values[f"/sys/class/dmi/id/{key}"].strip()
+        for key in keys
+        if f"/sys/class/dmi/id/{key}" in values
+    }
+
+
+def _disk_usage() -> List[Dict[str, Any]]:
+    """Usage of every mounted real filesystem (the df essentials)"""
+    disks = []
+    seen = set()
+    for source, mountpoint, fstype in _read_mounts():
+        # A tmpfs root (impermanence setups) is still the root filesystem
+        if fstype in _VIRTUAL_FSTYPES and not (fstype == 'tmpfs' and mountpoint == '/'):
+            continue
+        try:
+            # Like df, show a filesystem once however often it is bind mounted;
+            # btrfs subvolumes have their own st_dev and are kept
+            dev = os.stat(mountpoint).st_dev
+            if dev in seen:
+                continue
+            st = os.statvfs(mountpoint)
+        except OSError:
+            continue
+        seen.add(dev)
+        total = st.f_blocks * st.f_frsize
+        if not total:
+            continue
+        free = st.f_bavail * st.f_frsize
+        used = total - st.f_bfree * st.f_frsize
+        disks.append({
+            "mount": mountpoint,
+            "device": source,
+            "fstype": fstype,
+            "size_gb": round(total / 1024**3, 1),
+            "used_gb": round(used / 1024**3, 1),
+            "free_gb": round(free / 1024**3, 1),
+            "used_percent": round(used / (used + free) * 100, 1) if used + free else 0.0,
+        })
+    return disks
+
+
+def _summarize_ip_addr(ip_json: str) -> List[Dict[str, Any]]:
+    """Condense `ip -j addr show` output to the fields worth sending the model"""
+    interfaces = []
+    for link in json.loads(ip_json):
+        interfaces.append({
+            "name": link.get("ifname"),
+            "state": link.get("operstate"),
+            "mac": link.get("address"),
+            "mtu": link.get("mtu"),
+            "addresses": [
+                f"{addr['local']}/{addr['prefixlen']}"
+                for addr in link.get("addr_info", [])
+                if "local" in addr
+            ],
+        })
+    return interfaces
+
+
+def _parse_number(text: Any) -> Optional[float]:
+    """Get the leading number of a reading like '45.0', '20.5 W' or '[N/A]', or None"""
+    try:
+        return float(str(text).split()[0])
+    except (ValueError, IndexError):
+        return None
+
+
+def _gpu_reading(vendor: str, source: str, name: Optional[str] = None,
+                 temperatures: Optional[Dict[str, Optional[float]]] = None,
+                 utilization: Optional[float] = None, power: Optional[float] = None,
+                 clock_mhz: Optional[float] = None) -> Dict[str, Any]:
+    """Build one GPU entry; every source reports the same fields, None where unknown"""
+    temperatures = {label: value for label, value in (temperatures or {}).items() if value is not None}
+    return {
+        "vendor": vendor,
+        "source": source,
+        "name": name,
+        "temperature_celsius": next(iter(temperatures.values()), None),
+        "temperatures_celsius": temperatures,
+        "utilization_percent": utilization,
+        "power_watts": power,
+        "clock_mhz": clock_mhz,
+    }
+
+
+def _parse_nvidia_smi(csv_text: str) -> List[Dict[str, Any]]:
+    """Parse `nvidia-smi --query-gpu=index,name,temperature.gpu,utilization.gpu,power.draw,clocks.gr --format=csv,noheader,nounits`"""
+    gpus = []
+    for line in csv_text.splitlines():
+        fields = [field.strip() for field in line.split(',')]
+        if len(fields) != 6:
+            continue
+        index, name, temperature, utilization, power, clock = fields
+        gpus.append(_gpu_reading(
+            "nvidia", "nvidia-smi", name=f"{index}: {name}",
+            temperatures={"gpu": _parse_number(temperature)},
+            utilization=_parse_number(utilization),
+            power=_parse_number(power),
+            clock_mhz=_parse_number(clock),
+        ))
+    return gpus
+
+
+def _parse_rocm_smi(json_text: str) -> List[Dict[str, Any]]:
+    """Parse `rocm-smi --showtemp --showuse --showpower --json`"""
+    # rocm-smi may print warnings ahead of the JSON document
+    data = json.loads(json_text[json_text.find('{'):])
+    gpus = []
+    for card, fields in sorted(data.items()):
+        if not card.startswith('card'):
+            continue
+        temperatures, utilization, power = {}, None, None
+        for key, value in fields.items():
+            if key.startswith('Temperature') and key.endswith('(C)'):
+                # e.g. "Temperature (Sensor edge) (C)"
+                sensor = re.search(r'\(Sensor ([^)]+)\)', key)
+                temperatures[sensor.group(1) if sensor else key] = _parse_number(value)
+            elif key == 'GPU use (%)':
+                utilization = _parse_number(value)
+            elif 'Power' in key and key.endswith('(W)'):
+                power = _parse_number(value)
+        gpus.append(_gpu_reading(
+            "amd", "rocm-smi", name=card, temperatures=temperatures,
+            utilization=utilization, power=power,
+        ))
+    return gpus
+
+
+def _parse_sensors(json_text: str) -> List[Dict[str, Any]]:
+    """Pick GPU chips out of `sensors -j`"""
+    gpus = []
+    for chip, features in sorted(json.loads(json_text).items()):
+        vendor = next((v for prefix, v in _GPU_SENSOR_CHIPS if chip.startswith(prefix + '-')), None)
+        if vendor is None:
+            continue
+        temperatures, power = {}, None
+        for label, readings in features.items():
+            if not isinstance(readings, dict):
+                continue  # "Adapter"
+            for key, value in readings.items():
+                if key.startswith('temp') and key.endswith('_input'):
+                    temperatures[label] = value
+                elif power is None and key.startswith('power') and key.endswith(('_average', '_input')):
+                    power = value
+        gpus.append(_gpu_reading(vendor, "sensors", name=chip, temperatures=temperatures, power=power))
+    return gpus
+
+
+# Tool definitions in Ollama's format; constant, so built and serialized once
+_TOOL_DEFINITIONS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "execute_command",
+            "description": "Execute a shell command on the system. Use this to run system commands, check status, or gather information. Returns command output.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "command": {
+                        "type": "string",
+                        "description": "The shell command to execute (e.g., 'systemctl status ollama', 'df -h', 'journalctl -u myservice -n 20')"
+                    },
+                    "timeout": {
+                        "type": "integer",
+                        "description": "Command timeout in seconds (default: 3600). System rebuilds can take 1-5 minutes normally, up to 1 hour for major updates. Be patient!",
+                        "default": 3600
+                    }
+                },
+                "required": ["command"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "read_file",
+            "description": "Read the contents of a file from the filesystem. Use this to inspect configuration files, logs, or other text files.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "file_path": {
+                        "type": "string",
+                        "description": "Absolute path to the file to read (e.g., '/etc/nixos/configuration.nix', '/var/log/syslog')"
+                    },
+                    "max_lines": {
+                        "type": "integer",
+                        "description": "Maximum number of lines to read (default: 500)",
+                        "default": 500
+                    }
+                },
+                "required": ["file_path"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "check_service_status",
+            "description": "Check the status of a systemd service. Returns whether the service is active, enabled, and recent log entries.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "service_name": {
+                        "type": "string",
+                        "description": "Name of the systemd service (e.g., 'ollama.service', 'nginx', 'sshd')"
+                    }
+                },
+                "required": ["service_name"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "view_logs",
+            "description": "View systemd journal logs. Can filter by unit, time period, or priority.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "unit": {
+                        "type": "string",
+                        "description": "Systemd unit name to filter logs (e.g., 'ollama.service')"
+                    },
+                    "lines": {
+                        "type": "integer",
+                        "description": "Number of recent log lines to return (default: 50)",
+                        "default": 50
+                    },
+                    "priority": {
+                        "type": "string",
+                        "description": "Filter by priority: emerg, alert, crit, err, warning, notice, info, debug",
+                        "enum": ["emerg", "alert", "crit", "err", "warning", "notice", "info", "debug"]
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_system_metrics",
+            "description": "Get current system resource metrics including uptime, load average, memory, and disk usage per filesystem. Returns structured values.",
+            "parameters": {
+                "type": "object",
+                "properties": {}
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_hardware_info",
+            "description": "Get detailed hardware information including CPU model, GPU, network interfaces, storage devices, and memory specs. Returns comprehensive hardware inventory.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "detailed": {
+                        "type": "boolean",
+                        "description": "Also include raw lscpu, lsblk, lspci and lsusb output (slower)",
+                        "default": False
+                    }
+                }
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_gpu_metrics",
+            "description": "Get GPU temperature, utilization, clock speeds, and power usage. Works with AMD and NVIDIA GPUs. Returns one entry per GPU with the same fields for every vendor (null where unknown).",
+            "parameters": {
+                "type": "object",
+                "properties": {}
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "list_directory",
+            "description": "List contents of a directory. Returns file names, sizes, and permissions.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "directory_path": {
+                        "type": "string",
+                        "description": "Absolute path to the directory (e.g., '/etc', '/var/log')"
+                    },
+                    "show_hidden": {
+                        "type": "boolean",
+                        "description": "Include hidden files (starting with dot)",
+                        "default": False
+                    }
+                },
+                "required": ["directory_path"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "check_network",
+            "description": "Test network connectivity to a host. 'ping' is a fast TCP reachability check, 'icmp' runs a real ICMP ping, 'http' sends an HTTP HEAD request.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "host": {
+                        "type": "string",
+                        "description": "Hostname or IP address to check (e.g., 'google.com', '8.8.8.8')"
+                    },
+                    "method": {
+                        "type": "string",
+                        "description": "Test method to use",
+                        "enum": ["ping", "icmp", "http"],
+                        "default": "ping"
+                    }
+                },
+                "required": ["host"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "retrieve_cached_output",
+            "description": "Retrieve full cached output from a previous tool call. Use this when you need to see complete data that was summarized earlier. The cache_id is shown in hierarchical summaries.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "cache_id": {
+                        "type": "string",
+                        "description": "Cache ID from a previous tool summary (e.g., 'view_logs_20251006_103045')"
+                    },
+                    "max_chars": {
+                        "type": "integer",
+                        "description": "Maximum characters to return (default: 10000 for focused analysis)",
+                        "default": 10000
+                    }
+                },
+                "required": ["cache_id"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "send_notification",
+            "description": "Send a notification to the user via Gotify. Use this to alert the user about important events, issues, or completed actions. Choose appropriate priority based on urgency.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "title": {
+                        "type": "string",
+                        "description": "Notification title (brief, e.g., 'Service Alert', 'Action Complete')"
+                    },
+                    "message": {
+                        "type": "string",
+                        "description": "Notification message body (detailed description of the event)"
+                    },
+                    "priority": {
+                        "type": "integer",
+                        "description": "Priority level: 2=Low (info), 5=Medium (attention needed), 8=High (critical/urgent)",
+                        "enum": [2, 5, 8],
+                        "default": 5
+                    }
+                },
+                "required": ["title", "message"]
+            }
+        }
+    }
+]
+
+_TOOL_DEFINITIONS_JSON = json.dumps(_TOOL_DEFINITIONS, indent=2)
 
 
 class SysadminTools:
     """Collection of tools for system administration tasks"""
     
+    # Store paths of binaries materialized through nix-shell, keyed by
+    # (package, binary); shared by all instances. None = not resolvable.
+    _tool_paths: Dict[Tuple[str, str], Optional[str]] = {}
+    
+    # Seconds a hardware inventory stays valid
+    _HW_CACHE_TTL = 300
+    
+    # Methods the AI may invoke through execute_tool (one per tool definition)
+    _TOOL_METHODS = frozenset(
+        tool["function"]["name"] for tool in _TOOL_DEFINITIONS
+    )
+    
     def __init__(self, safe_mode: bool = True):
         """
         Initialize sysadmin tools
@@ -22,6 +767,11 @@ class SysadminTools:
             safe_mode: If True, restricts dangerous operations
         """
         self.safe_mode = safe_mode
+        self._notifier = None  # GotifyNotifier, created on first notification
+        self._hw_cache = {}  # detailed flag -> (monotonic timestamp, hardware info)
+        self._gpu_hwmon = None  # Cached _find_gpu_hwmons() result
+        self._gpu_fds: Dict[str, int] = {}  # sysfs path -> open fd
+        weakref.finalize(self, _close_fds, self._gpu_fds)
         self.allowed_commands = [
             'systemctl', 'journalctl', 'free', 'df', 'uptime',
             'ps', 'top', 'ip', 'ss', 'cat', 'ls', 'grep',
@@ -32,237 +782,66 @@ class SysadminTools:
             'reboot', 'shutdown', 'poweroff',  # System power management
             'logger'  # Logging for notifications
         ]
+        self._allowed = frozenset(self.allowed_commands)
     
     def get_tool_definitions(self) -> List[Dict[str, Any]]:
         """
         Return tool definitions in Ollama's format
         
         Returns:
-            List of tool definitions with JSON schema
+            List of tool definitions with JSON schema (shared; do not mutate)
         """
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "execute_command",
-                    "description": "Execute a shell command on the system. Use this to run system commands, check status, or gather information. Returns command output.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "command": {
-                                "type": "string",
-                                "description": "The shell command to execute (e.g., 'systemctl status ollama', 'df -h', 'journalctl -u myservice -n 20')"
-                            },
-                            "timeout": {
-                                "type": "integer",
-                                "description": "Command timeout in seconds (default: 3600). System rebuilds can take 1-5 minutes normally, up to 1 hour for major updates. Be patient!",
-                                "default": 3600
-                            }
-                        },
-                        "required": ["command"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "read_file",
-                    "description": "Read the contents of a file from the filesystem. Use this to inspect configuration files, logs, or other text files.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "file_path": {
-                                "type": "string",
-                                "description": "Absolute path to the file to read (e.g., '/etc/nixos/configuration.nix', '/var/log/syslog')"
-                            },
-                            "max_lines": {
-                                "type": "integer",
-                                "description": "Maximum number of lines to read (default: 500)",
-                                "default": 500
-                            }
-                        },
-                        "required": ["file_path"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "check_service_status",
-                    "description": "Check the status of a systemd service. Returns whether the service is active, enabled, and recent log entries.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "service_name": {
-                                "type": "string",
-                                "description": "Name of the systemd service (e.g., 'ollama.service', 'nginx', 'sshd')"
-                            }
-                        },
-                        "required": ["service_name"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "view_logs",
-                    "description": "View systemd journal logs. Can filter by unit, time period, or priority.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "unit": {
-                                "type": "string",
-                                "description": "Systemd unit name to filter logs (e.g., 'ollama.service')"
-                            },
-                            "lines": {
-                                "type": "integer",
-                                "description": "Number of recent log lines to return (default: 50)",
-                                "default": 50
-                            },
-                            "priority": {
-                                "type": "string",
-                                "description": "Filter by priority: emerg, alert, crit, err, warning, notice, info, debug",
-                                "enum": ["emerg", "alert", "crit", "err", "warning", "notice", "info", "debug"]
-                            }
-                        }
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_system_metrics",
-                    "description": "Get current system resource metrics including CPU, memory, disk, and load average.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {}
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_hardware_info",
-                    "description": "Get detailed hardware information including CPU model, GPU, network interfaces, storage devices, and memory specs. Returns comprehensive hardware inventory.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {}
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_gpu_metrics",
-                    "description": "Get GPU temperature, utilization, clock speeds, and power usage. Works with AMD and NVIDIA GPUs. Returns current GPU metrics.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {}
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "list_directory",
-                    "description": "List contents of a directory. Returns file names, sizes, and permissions.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "directory_path": {
-                                "type": "string",
-                                "description": "Absolute path to the directory (e.g., '/etc', '/var/log')"
-                            },
-                            "show_hidden": {
-                                "type": "boolean",
-                                "description": "Include hidden files (starting with dot)",
-                                "default": False
-                            }
-                        },
-                        "required": ["directory_path"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "check_network",
-                    "description": "Test network connectivity to a host. Can use ping or HTTP check.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "host": {
-                                "type": "string",
-                                "description": "Hostname or IP address to check (e.g., 'google.com', '8.8.8.8')"
-                            },
-                            "method": {
-                                "type": "string",
-                                "description": "Test method to use",
-                                "enum": ["ping", "http"],
-                                "default": "ping"
-                            }
-                        },
-                        "required": ["host"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "retrieve_cached_output",
-                    "description": "Retrieve full cached output from a previous tool call. Use this when you need to see complete data that was summarized earlier. The cache_id is shown in hierarchical summaries.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "cache_id": {
-                                "type": "string",
-                                "description": "Cache ID from a previous tool summary (e.g., 'view_logs_20251006_103045')"
-                            },
-                            "max_chars": {
-                                "type": "integer",
-                                "description": "Maximum characters to return (default: 10000 for focused analysis)",
-                                "default": 10000
-                            }
-                        },
-                        "required": ["cache_id"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "send_notification",
-                    "description": "Send a notification to the user via Gotify. Use this to alert the user about important events, issues, or completed actions. Choose appropriate priority based on urgency.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "title": {
-                                "type": "string",
-                                "description": "Notification title (brief, e.g., 'Service Alert', 'Action Complete')"
-                            },
-                            "message": {
-                                "type": "string",
-                                "description": "Notification message body (detailed description of the event)"
-                            },
-                            "priority": {
-                                "type": "integer",
-                                "description": "Priority level: 2=Low (info), 5=Medium (attention needed), 8=High (critical/urgent)",
-                                "enum": [2, 5, 8],
-                                "default": 5
-                            }
-                        },
-                        "required": ["title", "message"]
-                    }
-                }
-            }
-        ]
+        return _TOOL_DEFINITIONS
+    
+    def get_tool_definitions_json(self) -> str:
+        """Return the tool definitions pre-serialized as indented JSON"""
+        return _TOOL_DEFINITIONS_JSON
     
-    def execute_command(self, command: str, timeout: int = 3600) -> Dict[str, Any]:
-        """Execute a shell command safely (default timeout: 1 hour for system operations)"""
+    def _is_allowed_command(self, cmd_base: str) -> bool:
+        """
+        Check a command's first word against the safe-mode allowlist
+        
+        Bare names are looked up directly. Absolute paths are accepted only
+        when the binary name is allowed and it lives in a system bin
+        directory (e.g. /run/current-system/sw/bin/systemctl or a
+        /nix/store/...-pkg/bin path).
+        """
+        if cmd_base in self._allowed:
+            return True
+        directory, _, name = cmd_base.rpartition('/')
+        if not directory or name not in self._allowed:
+            return False
+        return directory in _SYSTEM_BIN_DIRS or _NIX_STORE_BIN_DIR.fullmatch(directory) is not None
+    
+    def execute_command(
+        self,
+        command: Union[str, List[str]],
+        timeout: int = 3600,
+        max_bytes: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute a command safely (default timeout: 1 hour for system operations)
+        
+        A string is run through the shell; an argv list is executed directly
+        without spawning a shell. If max_bytes is set, only the last max_bytes
+        of stdout are kept.
+        """
+        use_shell = isinstance(command, str)
+        command_line = command if use_shell else " ".join(command)
+        
+        # A system rebuild can change the hardware picture (drivers, kernel)
+        if any(marker in command_line for marker in _REBUILD_MARKERS):
+            self._hw_cache.clear()
+        
         # Safety check in safe mode
         if self.safe_mode:
-            cmd_base = command.split()[0] if command.strip() else ""
-            if cmd_base not in self.allowed_commands:
+            if use_shell:
+                # Only the first word matters; avoid splitting the whole command
+                stripped = command.lstrip()
+                cmd_base = stripped.split(None, 1)[0] if stripped else ""
+            else:
+                cmd_base = command[0] if command else ""
+            if not self._is_allowed_command(cmd_base):
                 return {
                     "success": False,
                     "error": f"Command '{cmd_base}' not in allowed list (safe mode enabled)",
@@ -271,12 +850,25 @@ class SysadminTools:
         
         # Automatically configure SSH commands using centralized command_patterns
         # See command_patterns.py for the single source of truth
-        command = transform_ssh_command(command)
+        if use_shell:
+            command = transform_ssh_command(command)
+            # Commands without shell syntax are exec'd directly: no /bin/sh,
+            # and CPython can use posix_spawn/vfork instead of a full fork
+            argv = _simple_argv(command)
+            if argv is not None:
+                use_shell = False
+        else:
+            argv = command
         
         try:
+            if max_bytes is not None:
+                return self._execute_capped(
+                    command if use_shell else argv, use_shell, timeout, max_bytes
+                )
+            
             result = subprocess.run(
-                command,
-                shell=True,
+                command if use_shell else argv,
+                shell=use_shell,
                 capture_output=True,
                 text=True,
                 timeout=timeout
@@ -302,6 +894,141 @@ class SysadminTools:
                 "command": command
             }
     
+    def _execute_capped(
+        self,
+        command: Union[str, List[str]],
+        use_shell: bool,
+        timeout: int,
+        max_bytes: int
+    ) -> Dict[str, Any]:
+        """
+        Run a command keeping only the last max_bytes of its stdout
+        
+        stdout is read in chunks and older chunks are dropped once the rest
+        still covers the cap, so memory stays bounded while the newest output
+        (the end of a log) is kept. A truncated result starts at the first
+        complete line, with a marker line on top. stderr goes to a temporary
+        file so a chatty stderr cannot block the child while stdout is read.
+        
+        Raises:
+            subprocess.TimeoutExpired: If the command ran longer than timeout
+        """
+        timed_out = threading.Event()
+        with tempfile.TemporaryFile() as stderr_file:
+            with subprocess.Popen(
+                command,
+                shell=use_shell,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file
+            ) as proc:
+                def _kill():
+                    timed_out.set()
+                    proc.kill()
+                
+                timer = threading.Timer(timeout, _kill)
+                timer.start()
+                try:
+                    chunks = deque()
+                    size = total = 0
+                    while True:
+                        chunk = proc.stdout.read1(65536)
+                        if not chunk:
+                            break
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        total += len(chunk)
+                        while size - len(chunks[0]) >= max_bytes:
+                            size -= len(chunks.popleft())
+                    returncode = proc.wait()
+                finally:
+                    timer.cancel()
+            
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(command, timeout)
+            
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode('utf-8', errors='replace')
+        
+        raw = b''.join(chunks)[-max_bytes:]
+        truncated = total > max_bytes
+        if truncated:
+            # Drop the partial first line
+            newline = raw.find(b'\n')
+            if newline != -1:
+                raw = raw[newline + 1:]
+        stdout = raw.decode('utf-8', errors='replace')
+        if truncated:
+            stdout = f"... truncated, showing the last {len(raw)} of {total} bytes ...\n" + stdout
+        
+        return {
+            "success": returncode == 0,
+            "exit_code": returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "truncated": truncated,
+            "command": command
+        }
+    
+    def _resolve_tool(self, pkg: str, binary: str) -> Optional[str]:
+        """
+        Resolve the store path of a binary provided by a nixpkgs package
+        
+        nix-shell is evaluated once per (pkg, binary); later calls reuse the
+        cached path for as long as it still exists (it can be garbage
+        collected, since nix-shell creates no GC root). In safe mode a binary
+        that is not allowlisted is never resolved, since running it would be
+        rejected anyway; the caller's nix-shell fallback is rejected at once.
+        """
+        if self.safe_mode and binary not in self._allowed:
+            return None
+        
+        key = (pkg, binary)
+        path = SysadminTools._tool_paths.get(key)
+        if path and os.access(path, os.X_OK):
+            return path
+        if key in SysadminTools._tool_paths and path is None:
+            return None
+        
+        path = None
+        try:
+            result = subprocess.run(
+                ['nix-shell', '-p', pkg, '--run', f'readlink -f "$(command -v {binary})"'],
+                capture_output=True,
+                text=True,
+                timeout=NIX_RESOLVE_TIMEOUT
+            )
+            resolved = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+            if result.returncode == 0 and resolved.startswith('/') and os.access(resolved, os.X_OK):
+                path = resolved
+        except Exception:
+            pass
+        
+        SysadminTools._tool_paths[key] = path
+        return path
+    
+    def _resolve_tools(self, tools: List[Tuple[str, str]]):
+        """Resolve several (pkg, binary) store paths concurrently"""
+        missing = [
+            key for key in tools
+            if key not in SysadminTools._tool_paths
+            and not (self.safe_mode and key[1] not in self._allowed)
+        ]
+        if len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                list(pool.map(lambda key: self._resolve_tool(*key), missing))
+    
+    def _tool_argv(self, pkg: str, binary: str, *args: str) -> List[str]:
+        """
+        Build an argv running a nixpkgs-provided binary
+        
+        Uses the cached store path when available, otherwise falls back to
+        running it through nix-shell.
+        """
+        path = self._resolve_tool(pkg, binary)
+        if path:
+            return [path, *args]
+        return ['nix-shell', '-p', pkg, '--run', shlex.join([binary, *args])]
+    
     def read_file(self, file_path: str, max_lines: int = 500) -> Dict[str, Any]:
         """Read a file safely"""
         try:
@@ -319,14 +1046,33 @@ class SysadminTools:
                     "error": f"Not a file: {file_path}"
                 }
             
-            # Read file with line limit
-            lines = []
-            with open(path, 'r', errors='replace') as f:
-                for i, line in enumerate(f):
-                    if i >= max_lines:
-                        lines.append(f"\n... truncated after {max_lines} lines ...")
+            # Read unbuffered in bulk, only as far as needed to cover
+            # max_lines (plus one more line to detect truncation). Lines may
+            # end in \n, \r\n or \r, so there are at least as many lines as
+            # either count
+            chunks = []
+            line_feeds = carriage_returns = 0
+            with open(path, 'rb', buffering=0) as f:
+                while max(line_feeds, carriage_returns) <= max_lines:
+                    chunk = f.read(65536)
+                    if not chunk:
                         break
-                    lines.append(line.rstrip('\n'))
+                    chunks.append(chunk)
+                    line_feeds += chunk.count(b'\n')
+                    carriage_returns += chunk.count(b'\r')
+            
+            # Universal newlines, as a text-mode read would give
+            text = b''.join(chunks).decode('utf-8', errors='replace')
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+            lines = text.split('\n', max_lines)
+            if len(lines) > max_lines:
+                # Last element holds everything past the line limit
+                remainder = lines.pop()
+                if remainder:
+                    lines.append(f"\n... truncated after {max_lines} lines ...")
+            elif lines[-1] == '':
+                # Trailing newline does not start another line
+                lines.pop()
             
             return {
                 "success": True,
@@ -351,20 +1097,30 @@ class SysadminTools:
         if not service_name.endswith('.service'):
             service_name = f"{service_name}.service"
         
-        # Get service status
-        status_result = self.execute_command(f"systemctl status {service_name}")
-        is_active_result = self.execute_command(f"systemctl is-active {service_name}")
-        is_enabled_result = self.execute_command(f"systemctl is-enabled {service_name}")
+        # One `systemctl show` replaces status/is-active/is-enabled; it and
+        # the journal query run concurrently
+        results = self._run_commands_concurrently({
+            "show": [
+                "systemctl", "show", service_name,
+                "--property=ActiveState,SubState,UnitFileState,LoadState"
+            ],
+            "logs": ["journalctl", "-u", service_name, "-n", "10", "--no-pager"],
+        })
         
-        # Get recent logs
-        logs_result = self.execute_command(f"journalctl -u {service_name} -n 10 --no-pager")
+        status_output = results["show"].get("stdout", "")
+        properties = {}
+        for line in status_output.splitlines():
+            key, sep, value = line.partition('=')
+            if sep:
+                properties[key] = value
         
         return {
             "service": service_name,
-            "active": is_active_result.get("stdout", "").strip() == "active",
-            "enabled": is_enabled_result.get("stdout", "").strip() == "enabled",
-            "status_output": status_result.get("stdout", ""),
-            "recent_logs": logs_result.get("stdout", "")
+            "active": properties.get("ActiveState") == "active",
+            "enabled": properties.get("UnitFileState") == "enabled",
+            "properties": properties,
+            "status_output": status_output,
+            "recent_logs": results["logs"].get("stdout", "")
         }
     
     def view_logs(
@@ -384,162 +1140,261 @@ class SysadminTools:
         if priority:
             cmd_parts.extend(["-p", priority])
         
-        command = " ".join(cmd_parts)
-        result = self.execute_command(command)
+        # Cap captured output so a huge `lines` value cannot pull the whole
+        # journal into memory; journalctl prints oldest first, so the cap
+        # keeps the newest entries
+        result = self.execute_command(cmd_parts, max_bytes=1 << 20)
         
         return {
             "logs": result.get("stdout", ""),
+            "truncated": result.get("truncated", False),
             "unit": unit,
             "lines": lines,
             "priority": priority
         }
     
     def get_system_metrics(self) -> Dict[str, Any]:
-        """Get current system metrics"""
-        # CPU and load
-        uptime_result = self.execute_command("uptime")
-        # Memory
-        free_result = self.execute_command("free -h")
-        # Disk
-        df_result = self.execute_command("df -h")
+        """Get current system metrics (load, memory, disk usage) as structured data"""
+        uptime_seconds = float(Path("/proc/uptime").read_text().split()[0])
         
         return {
-            "uptime": uptime_result.get("stdout", ""),
-            "memory": free_result.get("stdout", ""),
-            "disk": df_result.get("stdout", "")
+            "uptime_seconds": int(uptime_seconds),
+            "load": [round(value, 2) for value in os.getloadavg()],
+            "cpu_count": os.cpu_count(),
+            "memory": _read_meminfo(),
+            "disks": _disk_usage()
         }
     
-    def get_hardware_info(self) -> Dict[str, Any]:
-        """Get comprehensive hardware information"""
+    def _run_commands_concurrently(
+        self,
+        commands: Dict[str, Union[str, List[str]]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run independent commands in parallel threads
+        
+        Args:
+            commands: Mapping of result key to shell command or argv
+            
+        Returns:
+            Mapping of result key to execute_command() result
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(commands)) as pool:
+            futures = {
+                pool.submit(self.execute_command, command): key
+                for key, command in commands.items()
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+    
+    def get_hardware_info(self, detailed: bool = False) -> Dict[str, Any]:
+        """
+        Get comprehensive hardware information
+        
+        The inventory is read from procfs/sysfs; detailed=True additionally
+        runs lscpu, lsblk, lspci and lsusb. Results are cached for
+        _HW_CACHE_TTL seconds; a nixos-rebuild run through execute_command
+        invalidates the cache.
+        """
+        cached = self._hw_cache.get(detailed)
+        if cached is not None:
+            cached_at, hardware = cached
+            if time.monotonic() - cached_at < self._HW_CACHE_TTL:
+                return dict(hardware)
+        
+        hardware = self._collect_hardware_info(detailed)
+        self._hw_cache[detailed] = (time.monotonic(), hardware)
+        return dict(hardware)
+    
+    def _collect_hardware_info(self, detailed: bool) -> Dict[str, Any]:
+        """Run the hardware inventory probes"""
         hardware = {}
         
-        # CPU info (use nix-shell for util-linux)
-        cpu_result = self.execute_command("nix-shell -p util-linux --run lscpu")
-        if cpu_result.get("success"):
-            hardware["cpu"] = cpu_result.get("stdout", "")
-        
-        # Memory details
-        mem_result = self.execute_command("free -h")
-        if mem_result.get("success"):
-            hardware["memory"] = mem_result.get("stdout", "")
-        
-        # GPU info (lspci for AMD/NVIDIA) - use nix-shell for pciutils
-        gpu_result = self.execute_command("nix-shell -p pciutils --run \"lspci | grep -i 'vga\\|3d\\|display'\"")
-        if gpu_result.get("success"):
-            hardware["gpu"] = gpu_result.get("stdout", "")
-        
-        # Detailed GPU
-        lspci_detailed = self.execute_command("nix-shell -p pciutils --run \"lspci -v | grep -A 20 -i 'vga\\|3d\\|display'\"")
-        if lspci_detailed.get("success"):
-            hardware["gpu_detailed"] = lspci_detailed.get("stdout", "")
-        
-        # Network interfaces
-        net_result = self.execute_command("ip link show")
-        if net_result.get("success"):
-            hardware["network_interfaces"] = net_result.get("stdout", "")
-        
-        # Network addresses
-        addr_result = self.execute_command("ip addr show")
-        if addr_result.get("success"):
-            hardware["network_addresses"] = addr_result.get("stdout", "")
-        
-        # Storage devices (use nix-shell for util-linux)
-        storage_result = self.execute_command("nix-shell -p util-linux --run \"lsblk -o NAME,SIZE,TYPE,MOUNTPOINT,FSTYPE\"")
-        if storage_result.get("success"):
-            hardware["storage"] = storage_result.get("stdout", "")
-        
-        # PCI devices (comprehensive)
-        pci_result = self.execute_command("nix-shell -p pciutils --run lspci")
-        if pci_result.get("success"):
-            hardware["pci_devices"] = pci_result.get("stdout", "")
-        
-        # USB devices
-        usb_result = self.execute_command("nix-shell -p usbutils --run lsusb")
-        if usb_result.get("success"):
-            hardware["usb_devices"] = usb_result.get("stdout", "")
-        
-        # DMI/SMBIOS info (motherboard, system)
-        dmi_result = self.execute_command("cat /sys/class/dmi/id/board_name /sys/class/dmi/id/board_vendor 2>/dev/null")
-        if dmi_result.get("success"):
-            hardware["motherboard"] = dmi_result.get("stdout", "")
+        # Direct procfs/sysfs reads - no subprocess needed
+        readers = {
+            "cpu": _read_cpuinfo,
+            "memory": _read_meminfo,
+            "gpu": _list_gpus,
+            "storage": _list_block_devices,
+            "motherboard": _read_dmi,
+        }
+        for key, reader in readers.items():
+            try:
+                hardware[key] = reader()
+            except OSError as e:
+                hardware[f"{key}_error"] = str(e)
+        
+        # Every command probe is independent, so they run concurrently
+        probes = {
+            # Network interfaces and addresses (JSON output)
+            "network": ["ip", "-j", "addr", "show"],
+        }
+        
+        if detailed:
+            self._resolve_tools([
+                ('util-linux', 'lscpu'), ('util-linux', 'lsblk'),
+                ('pciutils', 'lspci'), ('usbutils', 'lsusb'),
+            ])
+            lspci = shlex.join(self._tool_argv('pciutils', 'lspci'))
+            lspci_verbose = shlex.join(self._tool_argv('pciutils', 'lspci', '-v'))
+            probes.update({
+                # CPU info (util-linux)
+                "lscpu": self._tool_argv('util-linux', 'lscpu'),
+                # GPU info (lspci for AMD/NVIDIA)
+                "gpu_lspci": f"{lspci} | grep -i 'vga\\|3d\\|display'",
+                # Detailed GPU
+                "gpu_detailed": f"{lspci_verbose} | grep -A 20 -i 'vga\\|3d\\|display'",
+                # Storage devices (util-linux)
+                "lsblk": self._tool_argv('util-linux', 'lsblk', '-o', 'NAME,SIZE,TYPE,MOUNTPOINT,FSTYPE'),
+                # PCI devices (comprehensive)
+                "pci_devices": self._tool_argv('pciutils', 'lspci'),
+                # USB devices
+                "usb_devices": self._tool_argv('usbutils', 'lsusb'),
+            })
+        
+        results = self._run_commands_concurrently(probes)
+        
+        # Keep the original probe order in the output
+        for key in probes:
+            if results[key].get("success"):
+                hardware[key] = results[key].get("stdout", "")
+        
+        if "network" in hardware:
+            try:
+                hardware["network"] = _summarize_ip_addr(hardware["network"])
+            except ValueError:
+                pass  # Keep the raw output if it is not JSON
         
         return hardware
     
+    def _read_gpu_sysfs(self, paths: List[str]) -> Dict[str, str]:
+        """
+        Read GPU sysfs attributes through file descriptors kept open
+        across calls
+        
+        Each value is re-read in place with pread(), so repeated polls cost
+        one syscall per attribute. A descriptor that fails (e.g. ENODEV
+        after a GPU hotplug) is closed and reopened on the next call.
+        """
+        values = {}
+        for path in paths:
+            fd = self._gpu_fds.get(path)
+            if fd is None:
+                try:
+                    fd = os.open(path, os.O_RDONLY)
+                except OSError:
+                    continue
+                self._gpu_fds[path] = fd
+            try:
+                values[path] = os.pread(fd, 4096, 0).decode('utf-8', errors='replace')
+            except OSError:
+                os.close(self._gpu_fds.pop(path))
+        return values
+    
+    def close_gpu_fds(self):
+        """Close the persistent GPU sysfs file descriptors"""
+        _close_fds(self._gpu_fds)
+    
     def get_gpu_metrics(self) -> Dict[str, Any]:
-        """Get GPU metrics (temperature, utilization, clocks, power)"""
+        """
+        Get GPU metrics (temperature, utilization, clocks, power)
+        
+        Returns:
+            {"gpus": [...]}, one entry per GPU in the _gpu_reading shape
+            whatever the source (sysfs, rocm-smi, nvidia-smi or sensors)
+        """
         metrics = {}
+        gpus = []
         
-        # Try AMD GPU via sysfs (DRM/hwmon)
+        # Try every DRM card via sysfs (hwmon)
         try:
-            # Find GPU hwmon directory
-            import glob
-            hwmon_dirs = glob.glob("/sys/class/drm/card*/device/hwmon/hwmon*")
+            # Find the cards' hwmon sensor files (once; redone only if a
+            # device stops answering)
+            if self._gpu_hwmon is None:
+                self._gpu_hwmon = _find_gpu_hwmons()
             
-            if hwmon_dirs:
-                hwmon_path = hwmon_dirs[0]
-                amd_metrics = {}
+            for device_path, vendor, temp_files, power_files in self._gpu_hwmon:
+                gpu_busy_file = f"{device_path}/gpu_busy_percent"
+                sclk_file = f"{device_path}/pp_dpm_sclk"
                 
-                # Temperature
-                temp_files = glob.glob(f"{hwmon_path}/temp*_input")
-                for temp_file in temp_files:
-                    try:
-                        with open(temp_file, 'r') as f:
-                            temp_millidegrees = int(f.read().strip())
-                            temp_celsius = temp_millidegrees / 1000
-                            label = temp_file.split('/')[-1].replace('_input', '')
-                            amd_metrics[f"{label}_celsius"] = temp_celsius
-                    except:
-                        pass
+                # Re-read every sysfs attribute through persistent fds
+                values = self._read_gpu_sysfs(
+                    temp_files + power_files + [gpu_busy_file, sclk_file]
+                )
+                if not values:
+                    self._gpu_hwmon = None
+                    continue
                 
-                # GPU busy percent (utilization)
-                gpu_busy_file = f"{hwmon_path.replace('/hwmon/hwmon', '')}/gpu_busy_percent"
-                try:
-                    with open(gpu_busy_file, 'r') as f:
-                        amd_metrics["gpu_utilization_percent"] = int(f.read().strip())
-                except:
-                    pass
+                # Temperature, per sensor (temp1 is the edge sensor)
+                temperatures = {}
+                for temp_file in temp_files:
+                    if temp_file in values:
+                        label = temp_file.split('/')[-1].replace('_input', '')
+                        value = _parse_number(values[temp_file])
+                        temperatures[label] = value / 1000 if value is not None else None
                 
                 # Power usage
-                power_files = glob.glob(f"{hwmon_path}/power*_average")
+                power = None
                 for power_file in power_files:
-                    try:
-                        with open(power_file, 'r') as f:
-                            power_microwatts = int(f.read().strip())
-                            power_watts = power_microwatts / 1000000
-                            amd_metrics["power_watts"] = power_watts
-                    except:
-                        pass
+                    value = _parse_number(values.get(power_file))
+                    if value is not None:
+                        power = value / 1000000
                 
-                # Clock speeds
-                sclk_file = f"{hwmon_path.replace('/hwmon/hwmon', '')}/pp_dpm_sclk"
-                try:
-                    with open(sclk_file, 'r') as f:
-                        sclk_data = f.read()
-                        amd_metrics["gpu_clocks"] = sclk_data.strip()
-                except:
-                    pass
+                # Current shader clock is the DPM level marked with '*'
+                clock_mhz = None
+                for line in values.get(sclk_file, "").splitlines():
+                    if line.rstrip().endswith('*'):
+                        level = re.search(r'(\d+)\s*mhz', line, re.IGNORECASE)
+                        clock_mhz = float(level.group(1)) if level else None
                 
-                if amd_metrics:
-                    metrics["amd_gpu"] = amd_metrics
+                gpus.append(_gpu_reading(
+                    vendor, "sysfs", name=device_path.split('/')[-2],
+                    temperatures=temperatures,
+                    utilization=_parse_number(values.get(gpu_busy_file)),
+                    power=power,
+                    clock_mhz=clock_mhz,
+                ))
         except Exception as e:
-            metrics["amd_sysfs_error"] = str(e)
+            metrics["sysfs_error"] = str(e)
         
-        # Try rocm-smi for AMD
-        rocm_result = self.execute_command("nix-shell -p rocmPackages.rocm-smi --run 'rocm-smi --showtemp --showuse --showpower'")
-        if rocm_result.get("success"):
-            metrics["rocm_smi"] = rocm_result.get("stdout", "")
+        # Vendor tools run concurrently; sensors is started speculatively
+        # and only used when no other GPU source answered
+        self._resolve_tools([
+            ('rocmPackages.rocm-smi', 'rocm-smi'),
+            ('linuxPackages.nvidia_x11', 'nvidia-smi'),
+            ('lm_sensors', 'sensors'),
+        ])
+        tool_results = self._run_commands_concurrently({
+            "rocm_smi": self._tool_argv('rocmPackages.rocm-smi', 'rocm-smi', '--showtemp', '--showuse', '--showpower', '--json'),
+            "nvidia_smi": self._tool_argv('linuxPackages.nvidia_x11', 'nvidia-smi', '--query-gpu=index,name,temperature.gpu,utilization.gpu,power.draw,clocks.gr', '--format=csv,noheader,nounits'),
+            "sensors": self._tool_argv('lm_sensors', 'sensors', '-j'),
+        })
         
-        # Try nvidia-smi for NVIDIA
-        nvidia_result = self.execute_command("nix-shell -p linuxPackages.nvidia_x11 --run 'nvidia-smi --query-gpu=temperature.gpu,utilization.gpu,power.draw,clocks.gr --format=csv'")
-        if nvidia_result.get("success") and "NVIDIA" in nvidia_result.get("stdout", ""):
-            metrics["nvidia_smi"] = nvidia_result.get("stdout", "")
+        # Each parser is tried on its own so one malformed output does not
+        # hide the others
+        parsers = [("nvidia_smi", _parse_nvidia_smi)]
+        if not any(gpu["vendor"] == "amd" for gpu in gpus):
+            # Same AMD cards as sysfs; only needed when sysfs found none
+            parsers.insert(0, ("rocm_smi", _parse_rocm_smi))
+        for key, parse in parsers:
+            result = tool_results[key]
+            if result.get("success"):
+                try:
+                    gpus.extend(parse(result.get("stdout", "")))
+                except (ValueError, AttributeError) as e:
+                    metrics[f"{key}_error"] = f"Unparseable output: {e}"
         
-        # Fallback: try sensors command
-        if not metrics.get("amd_gpu") and not metrics.get("nvidia_smi"):
-            sensors_result = self.execute_command("nix-shell -p lm_sensors --run sensors")
+        # Fallback: sensors command
+        if not gpus:
+            sensors_result = tool_results["sensors"]
             if sensors_result.get("success"):
-                metrics["sensors"] = sensors_result.get("stdout", "")
+                try:
+                    gpus.extend(_parse_sensors(sensors_result.get("stdout", "")))
+                except (ValueError, AttributeError) as e:
+                    metrics["sensors_error"] = f"Unparseable output: {e}"
         
+        metrics["gpus"] = gpus
         return metrics
     
     def list_directory(
@@ -547,41 +1402,98 @@ class SysadminTools:
         directory_path: str,
         show_hidden: bool = False
     ) -> Dict[str, Any]:
-        """List directory contents"""
-        cmd = f"ls -lh"
-        if show_hidden:
-            cmd += "a"
-        cmd += f" {directory_path}"
-        
-        result = self.execute_command(cmd)
-        
-        return {
-            "success": result.get("success", False),
-            "directory": directory_path,
-            "listing": result.get("stdout", ""),
-            "error": result.get("error")
-        }
+        """List directory contents, or describe a single file like `ls -lh file`"""
+        try:
+            # Like ls -l, a symlink given without a trailing slash is shown
+            # itself rather than followed
+            if not os.path.isdir(directory_path) or (
+                os.path.islink(directory_path) and not directory_path.endswith('/')
+            ):
+                st = os.lstat(directory_path)
+                rows = [_ls_row(directory_path, directory_path, st)]
+            else:
+                with os.scandir(directory_path) as it:
+                    entries = sorted(
+                        (entry for entry in it if show_hidden or not entry.name.startswith('.')),
+                        key=lambda entry: entry.name
+                    )
+                    rows = [
+                        _ls_row(entry.path, entry.name, entry.stat(follow_symlinks=False))
+                        for entry in entries
+                    ]
+            
+            return {
+                "success": True,
+                "directory": directory_path,
+                "listing": "\n".join(rows),
+                "error": None
+            }
+        except OSError as e:
+            return {
+                "success": False,
+                "directory": directory_path,
+                "listing": "",
+                "error": str(e)
+            }
     
     def check_network(self, host: str, method: str = "ping") -> Dict[str, Any]:
-        """Check network connectivity"""
+        """
+        Check network connectivity
+        
+        'ping' opens a TCP connection to port 443 (a refused connection still
+        proves the host is up), 'icmp' runs the ping command, and 'http'
+        issues a HEAD request with http.client.
+        """
         if method == "ping":
-            cmd = f"ping -c 3 -W 2 {host}"
+            try:
+                with socket.create_connection((host, 443), timeout=2):
+                    output = f"TCP connection to {host}:443 succeeded"
+                reachable, error = True, ""
+            except ConnectionRefusedError:
+                output = f"{host} refused TCP connection on port 443 (host is up)"
+                reachable, error = True, ""
+            except OSError as e:
+                output, reachable, error = "", False, str(e)
+        elif method == "icmp":
+            result = self.execute_command(["ping", "-c", "3", "-W", "2", host], timeout=10)
+            reachable = result.get("success", False)
+            output = result.get("stdout", "")
+            error = result.get("stderr", "") or result.get("error", "")
         elif method == "http":
-            cmd = f"curl -I -m 5 {host}"
+            conn = None
+            try:
+                # urlsplit and .port raise ValueError on a malformed URL
+                # (bad IPv6 literal, port out of range)
+                url = urlsplit(host if "://" in host else f"http://{host}")
+                if not url.hostname:
+                    raise ValueError(f"No hostname in {host!r}")
+                conn_class = (
+                    http.client.HTTPSConnection if url.scheme == "https"
+                    else http.client.HTTPConnection
+                )
+                conn = conn_class(url.hostname, url.port, timeout=5)
+                path = (url.path or "/") + (f"?{url.query}" if url.query else "")
+                conn.request("HEAD", path, headers={"Connection": "close"})
+                response = conn.getresponse()
+                output = f"HTTP/{response.version / 10:.1f} {response.status} {response.reason}"
+                reachable, error = True, ""
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                output, reachable, error = "", False, str(e)
+            finally:
+                if conn is not None:
+                    conn.close()
         else:
             return {
                 "success": False,
                 "error": f"Unknown method: {method}"
             }
         
-        result = self.execute_command(cmd, timeout=10)
-        
         return {
             "host": host,
             "method": method,
-            "reachable": result.get("success", False),
-            "output": result.get("stdout", ""),
-            "error": result.get("stderr", "")
+            "reachable": reachable,
+            "output": output,
+            "error": error
         }
     
     def retrieve_cached_output(self, cache_id: str, max_chars: int = 10000) -> Dict[str, Any]:
@@ -597,7 +1509,10 @@ class SysadminTools:
             }
         
         try:
-            content = cache_file.read_text()
+            # Single unbuffered read; the original size comes from stat()
+            size = cache_file.stat().st_size
+            with open(cache_file, 'rb', buffering=0) as f:
+                content = f.read().decode('utf-8', errors='replace')
             
             # Truncate if still too large for context
             if len(content) > max_chars:
@@ -611,7 +1526,7 @@ class SysadminTools:
             return {
                 "success": True,
                 "cache_id": cache_id,
-                "size": len(cache_file.read_text()),  # Original size
+                "size": size,  # Original size in bytes
                 "content": content
             }
         except Exception as e:
@@ -621,7 +1536,30 @@ class SysadminTools:
             }
     
     def send_notification(self, title: str, message: str, priority: int = 5) -> Dict[str, Any]:
-        """Send a notification to the user via Gotify using macha-notify command"""
+        """
+        Send a notification to the user via Gotify
+        
+        Posts directly over a kept-alive connection when GOTIFY_URL and
+        GOTIFY_TOKEN are set, otherwise falls back to the macha-notify command.
+        """
+        if self._notifier is None:
+            self._notifier = GotifyNotifier()
+        
+        if self._notifier.enabled:
+            if self._notifier.send(title, message, priority):
+                return {
+                    "success": True,
+                    "title": title,
+                    "message": message,
+                    "priority": priority,
+                    "output": "Notification sent successfully"
+                }
+            return {
+                "success": False,
+                "error": "Gotify rejected or did not receive the notification",
+                "hint": "Check that the Gotify server is reachable and gotifyToken is valid"
+            }
+        
         try:
             # Use the macha-notify command which handles Gotify integration
             result = subprocess.run(
@@ -662,28 +1600,36 @@ class SysadminTools:
                 "error": f"Unexpected error sending notification: {str(e)}"
             }
     
-    def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a tool by name with given arguments"""
-        tool_map = {
-            "execute_command": self.execute_command,
-            "read_file": self.read_file,
-            "check_service_status": self.check_service_status,
-            "view_logs": self.view_logs,
-            "get_system_metrics": self.get_system_metrics,
-            "get_hardware_info": self.get_hardware_info,
-            "get_gpu_metrics": self.get_gpu_metrics,
-            "list_directory": self.list_directory,
-            "check_network": self.check_network,
-            "retrieve_cached_output": self.retrieve_cached_output,
-            "send_notification": self.send_notification
-        }
+    @staticmethod
+    def serialize(result: Any) -> bytes:
+        """Serialize a tool result to JSON bytes (orjson when available)"""
+        return _dumps(result)
+    
+    def execute_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        serialize: bool = False
+    ) -> Any:
+        """
+        Execute a tool by name with given arguments
         
-        tool_func = tool_map.get(tool_name)
-        if not tool_func:
+        Args:
+            tool_name: Name of the tool to run
+            arguments: Keyword arguments for the tool
+            serialize: If True, return the result as JSON bytes instead of a dict
+        """
+        result = self._run_tool(tool_name, arguments)
+        return self.serialize(result) if serialize else result
+    
+    def _run_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch a tool call and wrap failures in an error result"""
+        if tool_name not in self._TOOL_METHODS:
             return {
                 "success": False,
                 "error": f"Unknown tool: {tool_name}"
             }
+        tool_func = getattr(self, tool_name)
         
         try:
             return tool_func(**arguments)
@@ -5,19 +5,69 @@ Watches for critical events and triggers reviews
 """
 
 import json
+import os
+import select
 import subprocess
 import time
 import re
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from pathlib import Path
 import psutil
-from collections import deque
+from collections import Counter, deque
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    from dasbus.connection import SystemMessageBus
+    DASBUS_AVAILABLE = True
+except ImportError:
+    DASBUS_AVAILABLE = False
+
+# Journal lines are parsed straight from the pipe's bytes; orjson.JSONDecodeError
+# subclasses json.JSONDecodeError so either parser can be caught the same way
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Prompt for classifying a single log entry with the small model
+_CLASSIFY_PROMPT = """Analyze this system log entry and provide:
+1. Severity (critical/high/medium/low)
+2. Category (system/service/security/network/disk/other)
+3. Brief summary (one line)
+4. Recommended action (if any)
+
+Log entry:
+Unit: {unit}
+Priority: {priority}
+Message: {message}
+
+Respond in JSON format.""".format
+
+
+def _stop_process(proc: subprocess.Popen) -> None:
+    """Terminate a helper subprocess and reap it"""
+    proc.kill()
+    proc.wait()
+    proc.stdout.close()
 
 
 class TriggerMonitor:
     """Lightweight monitoring that triggers reviews based on conditions"""
     
+    # Minimum seconds between metric samples; faster checks reuse the last one
+    METRIC_MIN_INTERVAL = 2.0
+    
     # Critical log patterns that should trigger immediate review
     CRITICAL_PATTERNS = [
         (r'kernel:.*panic', 'critical', 'Kernel panic detected'),
@@ -30,6 +80,22 @@ class TriggerMonitor:
         (r'timeout', 'low', 'Timeout detected'),
     ]
     
+    # Compiled once at class load: the fused alternation rejects the
+    # (common) non-matching message in a single scan, the per-pattern
+    # list then reports every pattern that hit
+    _FUSED_PATTERN = re.compile(
+        "|".join(f"(?P<p{i}>{p})" for i, (p, _, _) in enumerate(CRITICAL_PATTERNS)),
+        re.IGNORECASE
+    )
+    _COMPILED_PATTERNS = [re.compile(p, re.IGNORECASE) for p, _, _ in CRITICAL_PATTERNS]
+    
+    # Severity codes kept in the severity ring buffer; 0 marks an empty slot
+    SEVERITY_CODES = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+    SEVERITY_RING_SIZE = 1000
+    
+    # Journal PRIORITY values counted towards the error rate: emerg, alert, crit, err
+    _ERROR_PRIORITIES = frozenset({'0', '1', '2', '3'})
+    
     # Systemd units to always monitor
     CRITICAL_SERVICES = [
         'sshd', 'systemd-networkd', 'NetworkManager',
@@ -68,6 +134,9 @@ class TriggerMonitor:
             'load_per_cpu': 2.0,  # load average per CPU core
         }
         
+        # Metric thresholds unpacked once; call set_thresholds() to change them
+        self._metric_thresholds = self._unpack_thresholds()
+        
         self.small_model = small_model
         self.use_model = use_model
         
@@ -78,10 +147,35 @@ class TriggerMonitor:
             from llm_backend import LlamaCppBackend
             self.llm_backend = LlamaCppBackend(base_url=backend_url)
         
+        # Multi-pattern DFA scanner for CRITICAL_PATTERNS when available
+        self._hs_db = self._compile_hyperscan() if HYPERSCAN_AVAILABLE else None
+        
         # Event tracking
-        self.event_buffer = deque(maxlen=1000)  # Rolling buffer of events
+        self.event_buffer = deque(maxlen=50)  # Full recent events, for display
+        self._severity_ring = bytearray(self.SEVERITY_RING_SIZE)  # Severity codes of recent events
+        self._ring_head = 0
         self.last_journal_cursor = None
-        self.last_trigger_times = {}  # Debounce triggers
+        self._journal_proc = None  # Following journalctl, started on first check
+        self._journal_partial = b''  # Trailing incomplete line from the pipe
+        self._journal_finalizer = None
+        self.last_trigger_times = {}  # Debounce triggers: key -> time.monotonic()
+        self._pattern_keys = [f"pattern_{i}" for i in range(len(self.CRITICAL_PATTERNS))]
+        self._monitored_services = None  # CRITICAL_SERVICES present on this system
+        self._systemd = None  # systemd1 Manager DBus proxy, created on first use
+        
+        # Metric sampling; cpu_percent(interval=None) reports usage since the
+        # previous call on the same thread, so prime it here rather than
+        # sleeping on each check (check_all samples on the calling thread)
+        psutil.cpu_percent(interval=None)
+        self._cpu_count = psutil.cpu_count() or 1
+        self._last_metrics = None
+        self._last_metrics_time = 0.0
+        self._disk_check_every = 30  # Disk usage moves slowly; statvfs every N checks
+        self._metric_ticks = 0
+        self._disk_percent = None
+        
+        # Threads for running the independent checks in check_all
+        self._check_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="trigger-check")
         
         # Statistics
         self.stats = {
@@ -101,24 +195,37 @@ class TriggerMonitor:
         self.stats['checks_performed'] += 1
         triggers = []
         
-        # Check system metrics
-        metric_triggers = self._check_metrics()
-        triggers.extend(metric_triggers)
+        # All triggers from one check share its timestamp
+        timestamp = datetime.now(timezone.utc).isoformat()
         
-        # Check systemd services
-        service_triggers = self._check_services()
-        triggers.extend(service_triggers)
-        
-        # Check journal logs
-        log_triggers = self._check_journal_logs()
-        triggers.extend(log_triggers)
+        # Sample metrics here rather than on a pool thread: psutil keeps the
+        # cpu_percent baseline per thread, so it must always be read from one
+        try:
+            metrics = self._sample_metrics()
+        except Exception as e:
+            print(f"Error sampling metrics: {e}")
+            metrics = None
+        
+        # Check system metrics, systemd services and journal logs concurrently;
+        # each check only touches its own state and returns its own list
+        futures = [
+            self._check_pool.submit(self._check_metrics, timestamp, metrics),
+            self._check_pool.submit(self._check_services, timestamp),
+            self._check_pool.submit(self._check_journal_logs, timestamp),
+        ]
+        for future in futures:
+            triggers.extend(future.result())
         
         # Update statistics
         self.stats['triggers_fired'] += len(triggers)
         
-        # Add to event buffer
+        # Add to event buffer and severity ring
         for trigger in triggers:
             self.event_buffer.append(trigger)
+            code = self.SEVERITY_CODES.get(trigger.get('severity'))
+            if code:
+                self._severity_ring[self._ring_head] = code
+                self._ring_head = (self._ring_head + 1) % self.SEVERITY_RING_SIZE
         
         return triggers
     
@@ -142,14 +249,45 @@ class TriggerMonitor:
         processes.sort(key=lambda x: x.get(sort_by, 0.0), reverse=True)
         return processes[:limit]
 
-    def _check_metrics(self) -> List[Dict[str, Any]]:
-        """Check system metrics against thresholds"""
+    def _unpack_thresholds(self) -> Tuple[float, float, float, float]:
+        """Get the (cpu, memory, disk, load per CPU) thresholds used by _check_metrics"""
+        return (
+            self.thresholds['cpu_percent'],
+            self.thresholds['memory_percent'],
+            self.thresholds['disk_percent'],
+            self.thresholds['load_per_cpu']
+        )
+    
+    def set_thresholds(self, thresholds: Dict[str, float]) -> None:
+        """Update metric thresholds"""
+        self.thresholds.update(thresholds)
+        self._metric_thresholds = self._unpack_thresholds()
+    
+    def _sample_metrics(self) -> Tuple[float, float, float]:
+        """Get (cpu_percent, memory_percent, load_per_cpu), sampled at most every METRIC_MIN_INTERVAL"""
+        now = time.monotonic()
+        if self._last_metrics is None or now - self._last_metrics_time >= self.METRIC_MIN_INTERVAL:
+            self._last_metrics = (
+                psutil.cpu_percent(interval=None),
+                psutil.virtual_memory().percent,
+                psutil.getloadavg()[0] / self._cpu_count  # 1-minute load
+            )
+            self._last_metrics_time = now
+        return self._last_metrics
+    
+    def _check_metrics(self, timestamp: str,
+                       metrics: Optional[Tuple[float, float, float]]) -> List[Dict[str, Any]]:
+        """Check system metrics (from _sample_metrics) against thresholds"""
         triggers = []
+        if metrics is None:
+            return triggers
         
         try:
+            cpu_percent, memory_percent, load_per_cpu = metrics
+            cpu_threshold, memory_threshold, disk_threshold, load_threshold = self._metric_thresholds
+            
             # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-            if cpu_percent > self.thresholds['cpu_percent']:
+            if cpu_percent > cpu_threshold:
                 if self._should_trigger('cpu_high'):
                     top_procs = self._get_top_processes('cpu_percent')
                     triggers.append({
@@ -157,48 +295,47 @@ class TriggerMonitor:
                         'trigger_type': 'cpu_high',
                         'severity': 'medium',
                         'value': cpu_percent,
-                        'threshold': self.thresholds['cpu_percent'],
-                        'message': f"CPU usage {cpu_percent:.1f}% exceeds threshold {self.thresholds['cpu_percent']:.1f}%",
+                        'threshold': cpu_threshold,
+                        'message': f"CPU usage {cpu_percent:.1f}% exceeds threshold {cpu_threshold:.1f}%",
                         'top_processes': top_procs,
-                        'timestamp': datetime.now(timezone.utc).isoformat()
+                        'timestamp': timestamp
                     })
             
             # Memory usage
-            memory = psutil.virtual_memory()
-            if memory.percent > self.thresholds['memory_percent']:
+            if memory_percent > memory_threshold:
                 if self._should_trigger('memory_high'):
                     top_procs = self._get_top_processes('memory_percent')
                     triggers.append({
                         'type': 'metric_threshold',
                         'trigger_type': 'memory_high',
                         'severity': 'medium',
-                        'value': memory.percent,
-                        'threshold': self.thresholds['memory_percent'],
-                        'message': f"Memory usage {memory.percent:.1f}% exceeds threshold {self.thresholds['memory_percent']:.1f}%",
+                        'value': memory_percent,
+                        'threshold': memory_threshold,
+                        'message': f"Memory usage {memory_percent:.1f}% exceeds threshold {memory_threshold:.1f}%",
                         'top_processes': top_procs,
-                        'timestamp': datetime.now(timezone.utc).isoformat()
+                        'timestamp': timestamp
                     })
             
             # Disk usage
-            disk = psutil.disk_usage('/')
-            if disk.percent > self.thresholds['disk_percent']:
+            if self._metric_ticks % self._disk_check_every == 0:
+                self._disk_percent = psutil.disk_usage('/').percent
+            self._metric_ticks += 1
+            disk_percent = self._disk_percent
+            
+            if disk_percent > disk_threshold:
                 if self._should_trigger('disk_high'):
                     triggers.append({
                         'type': 'metric_threshold',
                         'trigger_type': 'disk_high',
                         'severity': 'high',
-                        'value': disk.percent,
-                        'threshold': self.thresholds['disk_percent'],
-                        'message': f"Disk usage {disk.percent:.1f}% exceeds threshold {self.thresholds['disk_percent']:.1f}%",
-                        'timestamp': datetime.now(timezone.utc).isoformat()
+                        'value': disk_percent,
+                        'threshold': disk_threshold,
+                        'message': f"Disk usage {disk_percent:.1f}% exceeds threshold {disk_threshold:.1f}%",
+                        'timestamp': timestamp
                     })
             
             # Load average
-            load_avg = psutil.getloadavg()[0]  # 1-minute load
-            cpu_count = psutil.cpu_count()
-            load_per_cpu = load_avg / cpu_count if cpu_count else load_avg
-            
-            if load_per_cpu > self.thresholds['load_per_cpu']:
+            if load_per_cpu > load_threshold:
                 if self._should_trigger('load_high'):
                     top_procs = self._get_top_processes('cpu_percent') # Load usually correlates with CPU
                     triggers.append({
@@ -206,10 +343,10 @@ class TriggerMonitor:
                         'trigger_type': 'load_high',
                         'severity': 'medium',
                         'value': load_per_cpu,
-                        'threshold': self.thresholds['load_per_cpu'],
-                        'message': f"Load average per CPU {load_per_cpu:.2f} exceeds threshold {self.thresholds['load_per_cpu']:.2f}",
+                        'threshold': load_threshold,
+                        'message': f"Load average per CPU {load_per_cpu:.2f} exceeds threshold {load_threshold:.2f}",
                         'top_processes': top_procs,
-                        'timestamp': datetime.now(timezone.utc).isoformat()
+                        'timestamp': timestamp
                     })
         
         except Exception as e:
@@ -217,33 +354,18 @@ class TriggerMonitor:
         
         return triggers
     
-    def _check_services(self) -> List[Dict[str, Any]]:
+    def _check_services(self, timestamp: str) -> List[Dict[str, Any]]:
         """Check critical systemd services"""
         triggers = []
         
         try:
-            for service in self.CRITICAL_SERVICES:
-                # Check if service exists first
-                exists_check = subprocess.run(
-                    ["systemctl", "list-unit-files", f"{service}.service"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                if f"{service}.service" not in exists_check.stdout:
-                    continue  # Service not found on this system, skip it
-                
-                # Check service status
-                result = subprocess.run(
-                    ["systemctl", "is-active", service],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                
-                status = result.stdout.strip()
-                
+            if self._monitored_services is None:
+                self._monitored_services = self._find_existing_services(self.CRITICAL_SERVICES)
+            if not self._monitored_services:
+                return triggers
+            
+            states = self._get_service_states(self._monitored_services)
+            for service, status in states.items():
                 if status not in ['active', 'activating']:
                     if self._should_trigger(f'service_{service}_failed'):
                         triggers.append({
@@ -253,7 +375,7 @@ class TriggerMonitor:
                             'service': service,
                             'status': status,
                             'message': f"Critical service {service} is {status}",
-                            'timestamp': datetime.now(timezone.utc).isoformat()
+                            'timestamp': timestamp
                         })
         
         except Exception as e:
@@ -261,78 +383,104 @@ class TriggerMonitor:
         
         return triggers
     
-    def _check_journal_logs(self) -> List[Dict[str, Any]]:
+    def _get_service_states(self, services: List[str]) -> Dict[str, str]:
+        """Get the ActiveState of each service, over DBus when available"""
+        if DASBUS_AVAILABLE and self._systemd is not False:
+            try:
+                if self._systemd is None:
+                    self._systemd = SystemMessageBus().get_proxy(
+                        "org.freedesktop.systemd1", "/org/freedesktop/systemd1"
+                    )
+                units = self._systemd.ListUnitsByPatterns([], [f"{s}.service" for s in services])
+                active = {unit[0][:-len(".service")]: unit[3] for unit in units}
+                # Units systemd has not loaded are not listed, and are inactive
+                return {s: active.get(s, 'inactive') for s in services}
+            except Exception as e:
+                print(f"Error querying systemd over DBus, using systemctl: {e}")
+                self._systemd = False
+        
+        # One is-active call prints a status line per unit, in argument order
+        result = subprocess.run(
+            ["systemctl", "is-active", *services],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        return dict(zip(services, result.stdout.splitlines()))
+    
+    def _find_existing_services(self, services: List[str]) -> List[str]:
+        """Return the services whose unit files exist on this system"""
+        result = subprocess.run(
+            ["systemctl", "list-unit-files", "--no-legend", *(f"{s}.service" for s in services)],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        
+        existing = {line.split(None, 1)[0] for line in result.stdout.splitlines() if line.strip()}
+        return [s for s in services if f"{s}.service" in existing]
+    
+    def _check_journal_logs(self, timestamp: str) -> List[Dict[str, Any]]:
         """Check systemd journal for critical patterns"""
         triggers = []
         
         try:
-            # Get recent journal entries
-            cmd = ["journalctl", "-n", "100", "--output=json", "--no-pager"]
-            
-            # If we have a cursor, get entries after it
-            if self.last_journal_cursor:
-                cmd.extend(["--after-cursor", self.last_journal_cursor])
-            else:
-                # First run, get last 5 minutes
-                cmd.extend(["--since", "5 minutes ago"])
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                return triggers
-            
-            # Parse journal entries
+            # Parse journal entries written since the last check
             entries = []
-            for line in result.stdout.strip().split('\n'):
+            error_count = 0
+            for line in self._read_journal_lines()[-100:]:
                 if not line:
                     continue
                 try:
-                    entry = json.loads(line)
+                    entry = _json_loads(line)
                     entries.append(entry)
                 except json.JSONDecodeError:
                     continue
+                if entry.get('PRIORITY') in self._ERROR_PRIORITIES:
+                    error_count += 1
             
             # Update cursor to last entry
             if entries:
                 self.last_journal_cursor = entries[-1].get('__CURSOR')
             
             # Check each entry against patterns
+            pending = []  # (trigger, message, entry) awaiting model classification
             for entry in entries:
                 message = entry.get('MESSAGE', '')
                 
                 # Pattern matching
-                for pattern, severity, description in self.CRITICAL_PATTERNS:
-                    if re.search(pattern, message, re.IGNORECASE):
-                        self.stats['patterns_matched'] += 1
+                for idx in self._match_patterns(message):
+                    pattern, severity, description = self.CRITICAL_PATTERNS[idx]
+                    self.stats['patterns_matched'] += 1
+                    
+                    if self._should_trigger(self._pattern_keys[idx], debounce_seconds=60):
+                        trigger = {
+                            'type': 'log_pattern',
+                            'trigger_type': 'pattern_match',
+                            'severity': severity,
+                            'pattern': pattern,
+                            'description': description,
+                            'message': message[:200],  # Truncate
+                            'unit': entry.get('SYSLOG_IDENTIFIER', ''),
+                            'timestamp': timestamp
+                        }
                         
-                        trigger_key = f"pattern_{pattern[:20]}"
-                        if self._should_trigger(trigger_key, debounce_seconds=60):
-                            trigger = {
-                                'type': 'log_pattern',
-                                'trigger_type': 'pattern_match',
-                                'severity': severity,
-                                'pattern': pattern,
-                                'description': description,
-                                'message': message[:200],  # Truncate
-                                'unit': entry.get('SYSLOG_IDENTIFIER', ''),
-                                'timestamp': datetime.now(timezone.utc).isoformat()
-                            }
-                            
-                            # Use small model to classify if enabled
-                            if self.use_model:
-                                classification = self._classify_log_with_model(message, entry)
-                                if classification:
-                                    trigger['ai_classification'] = classification
-                            
-                            triggers.append(trigger)
+                        # Queue for classification by the small model if enabled
+                        if self.use_model:
+                            pending.append((trigger, message, entry))
+                        
+                        triggers.append(trigger)
+            
+            # Classify all matched entries in one batch
+            if pending:
+                classifications = self._classify_logs_with_model(
+                    [(message, entry) for _, message, entry in pending]
+                )
+                for (trigger, _, _), classification in zip(pending, classifications):
+                    if classification:
+                        trigger['ai_classification'] = classification
             
             # Check error rate
-            error_count = sum(1 for e in entries if e.get('PRIORITY', '7') <= '3')  # err, crit, alert, emerg
             if error_count > self.thresholds['error_log_rate']:
                 if self._should_trigger('error_rate_high'):
                     triggers.append({
@@ -342,7 +490,7 @@ class TriggerMonitor:
                         'error_count': error_count,
                         'threshold': self.thresholds['error_log_rate'],
                         'message': f"High error rate: {error_count} errors in recent logs",
-                        'timestamp': datetime.now(timezone.utc).isoformat()
+                        'timestamp': timestamp
                     })
         
         except Exception as e:
@@ -350,55 +498,137 @@ class TriggerMonitor:
         
         return triggers
     
-    def _classify_log_with_model(self, message: str, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Use small model to classify log severity and extract information"""
+    def _start_journal_stream(self) -> None:
+        """Start a following journalctl whose JSON output is drained on each check"""
+        self.close()
+        
+        # No priority filter: patterns such as "Connection refused" and
+        # "timeout" are often logged at info or notice
+        cmd = ["journalctl", "-f", "-n", "100", "--output=json", "--no-pager"]
+        if self.last_journal_cursor:
+            cmd.extend(["--after-cursor", self.last_journal_cursor])
+        else:
+            # First run, get last 5 minutes
+            cmd.extend(["--since", "5 minutes ago"])
+        
+        self._journal_proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        os.set_blocking(self._journal_proc.stdout.fileno(), False)
+        self._journal_partial = b''
+        self._journal_finalizer = weakref.finalize(self, _stop_process, self._journal_proc)
+        
+        # Give journalctl a moment to emit the backlog so the first check sees it
+        select.select([self._journal_proc.stdout], [], [], 2)
+    
+    def _read_journal_lines(self) -> List[bytes]:
+        """Return the complete lines journalctl has written since the last call"""
+        if self._journal_proc is None:
+            self._start_journal_stream()
+        
+        fd = self._journal_proc.stdout.fileno()
+        chunks = [self._journal_partial]
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                # journalctl exited; restart from the cursor on the next check
+                self.close()
+                break
+            chunks.append(chunk)
+        
+        complete, _, self._journal_partial = b''.join(chunks).rpartition(b'\n')
+        return complete.split(b'\n') if complete else []
+    
+    def close(self) -> None:
+        """Stop the journalctl stream, if running"""
+        if self._journal_finalizer is not None:
+            self._journal_finalizer()
+            self._journal_finalizer = None
+        self._journal_proc = None
+    
+    def _compile_hyperscan(self):
+        """Compile CRITICAL_PATTERNS into a hyperscan block-mode database"""
         try:
-            self.stats['model_classifications'] += 1
-            
-            # Prepare context
-            unit = entry.get('SYSLOG_IDENTIFIER', 'unknown')
-            priority = entry.get('PRIORITY', '6')
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[p.encode() for p, _, _ in self.CRITICAL_PATTERNS],
+                ids=list(range(len(self.CRITICAL_PATTERNS))),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(self.CRITICAL_PATTERNS)
+            )
+            return db
+        except Exception as e:
+            print(f"Error compiling hyperscan database, using re: {e}")
+            return None
+    
+    def _match_patterns(self, message: str) -> List[int]:
+        """Return the indices of all CRITICAL_PATTERNS found in message, in order"""
+        if self._hs_db is not None:
+            hits = []
+            self._hs_db.scan(
+                message.encode('utf-8', 'replace'),
+                match_event_handler=lambda idx, start, end, flags, context: hits.append(idx)
+            )
+            return sorted(hits)
+        
+        first = self._FUSED_PATTERN.search(message)
+        if not first:
+            return []
+        
+        first_idx = int(first.lastgroup[1:])
+        return [
+            idx for idx, regex in enumerate(self._COMPILED_PATTERNS)
+            if idx == first_idx or regex.search(message)
+        ]
+    
+    def _classify_logs_with_model(self, logs: List[Tuple[str, Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        """Use small model to classify log severity and extract information, one result per (message, entry)"""
+        try:
+            self.stats['model_classifications'] += len(logs)
             
-            prompt = f"""Analyze this system log entry and provide:
-1. Severity (critical/high/medium/low)
-2. Category (system/service/security/network/disk/other)
-3. Brief summary (one line)
-4. Recommended action (if any)
-
-Log entry:
-Unit: {unit}
-Priority: {priority}
-Message: {message[:500]}
-
-Respond in JSON format."""
+            prompts = []
+            for message, entry in logs:
+                # Prepare context
+                unit = entry.get('SYSLOG_IDENTIFIER', 'unknown')
+                priority = entry.get('PRIORITY', '6')
+                
+                prompts.append(_CLASSIFY_PROMPT(unit=unit, priority=priority, message=message[:500]))
 
-            # Use LLM backend abstraction
-            response_text = self.llm_backend.generate(
-                prompt=prompt,
+            # Use LLM backend abstraction; requests are batched by the server
+            responses = self.llm_backend.generate_batch(
+                prompts=prompts,
                 model=self.small_model,
                 temperature=0.3,
                 max_tokens=200
             )
-            
-            if response_text and not response_text.startswith("Error:"):
-                # Try to extract JSON from response
-                try:
-                    # Look for JSON in the response
-                    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                    if json_match:
-                        classification = json.loads(json_match.group())
-                        return classification
-                except:
-                    pass
-                
-                # Fallback: parse as text
-                return {
-                    'raw_response': response_text[:200],
-                    'model': self.small_model
-                }
+            return [self._parse_classification(response_text) for response_text in responses]
         
         except Exception as e:
-            print(f"Error classifying log with model: {e}")
+            print(f"Error classifying logs with model: {e}")
+        
+        return [None] * len(logs)
+    
+    def _parse_classification(self, response_text: str) -> Optional[Dict[str, Any]]:
+        """Extract the classification from a model response"""
+        if response_text and not response_text.startswith("Error:"):
+            # Try to extract JSON from response: first '{' through last '}'
+            start = response_text.find('{')
+            end = response_text.rfind('}')
+            if start != -1 and end > start:
+                try:
+                    return _json_loads(response_text[start:end + 1])
+                except (ValueError, TypeError):
+                    pass
+            
+            # Fallback: parse as text
+            return {
+                'raw_response': response_text[:200],
+                'model': self.small_model
+            }
         
         return None
     
@@ -413,14 +643,10 @@ Respond in JSON format."""
         Returns:
             True if trigger should fire
         """
-        now = datetime.now(timezone.utc)
+        now = time.monotonic()
         
-        if trigger_key not in self.last_trigger_times:
-            self.last_trigger_times[trigger_key] = now
-            return True
-        
-        last_trigger = self.last_trigger_times[trigger_key]
-        if (now - last_trigger).total_seconds() >= debounce_seconds:
+        last_trigger = self.last_trigger_times.get(trigger_key)
+        if last_trigger is None or now - last_trigger >= debounce_seconds:
             self.last_trigger_times[trigger_key] = now
             return True
         
@@ -430,11 +656,19 @@ Respond in JSON format."""
         """Get recent events from buffer"""
         return list(self.event_buffer)
     
+    def get_severity_counts(self) -> Dict[str, int]:
+        """Count recent events (up to SEVERITY_RING_SIZE) by severity"""
+        return {
+            severity: self._severity_ring.count(code)
+            for severity, code in self.SEVERITY_CODES.items()
+        }
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get monitoring statistics"""
         return {
             **self.stats,
             'buffer_size': len(self.event_buffer),
+            'severity_counts': self.get_severity_counts(),
             'tracked_triggers': len(self.last_trigger_times)
         }
     
@@ -451,22 +685,11 @@ Respond in JSON format."""
         if not triggers:
             return False
         
-        # Critical triggers always warrant review
-        critical_count = sum(1 for t in triggers if t.get('severity') == 'critical')
-        if critical_count > 0:
-            return True
-        
-        # High severity with multiple occurrences
-        high_count = sum(1 for t in triggers if t.get('severity') == 'high')
-        if high_count >= 2:
-            return True
+        counts = Counter(t.get('severity') for t in triggers)
         
-        # Many medium severity issues
-        medium_count = sum(1 for t in triggers if t.get('severity') == 'medium')
-        if medium_count >= 3:
-            return True
-        
-        return False
+        # Critical triggers always warrant review, as do repeated high
+        # severity triggers or many medium severity issues
+        return counts['critical'] > 0 or counts['high'] >= 2 or counts['medium'] >= 3
     
     def format_triggers_for_context(self, triggers: List[Dict[str, Any]]) -> str:
         """Format triggers for context manager"""
@@ -4,17 +4,47 @@ Web Server - FastAPI backend for web interface
 Provides real-time system status and AI summaries
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple, Union
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from operator import itemgetter
+import gzip
+import hashlib
+import importlib.util
 import json
+import mmap
+import os
 import asyncio
 import psutil
 import socket
+import time
+import uvicorn
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    DefaultResponse = JSONResponse
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    from dasbus.connection import SystemMessageBus
+    DASBUS_AVAILABLE = True
+except ImportError:
+    DASBUS_AVAILABLE = False
 
 # Import our components
 from context_manager import ContextManager
@@ -22,27 +52,154 @@ from timeseries_db import TimeSeriesDB
 from trigger_monitor import TriggerMonitor
 
 
-app = FastAPI(title="AI Sysadmin Web Interface")
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Configure based on deployment
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize datetimes as ISO 8601, like orjson does"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to a JSON string, with orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, default=_json_default)
+
+
+def _ws_encode(status: Dict[str, Any]) -> Union[bytes, str]:
+    """Encode a status snapshot for WebSocket clients: MessagePack when available, else JSON"""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(status, use_bin_type=True)
+    return _json_dumps(status)
+
+
+app = FastAPI(title="AI Sysadmin Web Interface", default_response_class=DefaultResponse)
+
+# Cross-origin access is opt-in: the dashboard is served from this app, so
+# same-origin requests never need CORS. List extra origins comma-separated.
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ORIGINS", "").split(",")
+    if origin.strip()
+]
+if CORS_ORIGINS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_methods=["GET"],
+        allow_headers=["Content-Type"],
+    )
+
+# Compress API responses and static assets for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=4)
+
+# Dashboard page, stylesheet and script
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
+# The page never changes at runtime, so read it, compress it and compute
+# the ETag of each encoding once
+_INDEX_BYTES = (STATIC_DIR / "index.html").read_bytes()
+_INDEX_GZ = gzip.compress(_INDEX_BYTES, 9)
+_INDEX_DIGEST = hashlib.md5(_INDEX_BYTES).hexdigest()
+_INDEX_ETAG = f'"{_INDEX_DIGEST}"'
+_INDEX_GZ_ETAG = f'"{_INDEX_DIGEST}-gzip"'
+_INDEX_HEADERS = {
+    "ETag": _INDEX_ETAG,
+    "Cache-Control": "public, max-age=60",
+    "Vary": "Accept-Encoding",
+}
+_INDEX_GZ_HEADERS = {**_INDEX_HEADERS, "ETag": _INDEX_GZ_ETAG, "Content-Encoding": "gzip"}
+
+# Fixed for the life of the process
+HOSTNAME = socket.gethostname()
+
+# On Linux the fast status tier reads /proc/stat and /proc/meminfo through
+# descriptors opened once, instead of psutil opening and parsing them on
+# every call; psutil is used elsewhere
+try:
+    _PROC_STAT_FD = os.open("/proc/stat", os.O_RDONLY)
+    _PROC_MEMINFO_FD = os.open("/proc/meminfo", os.O_RDONLY)
+    PROC_AVAILABLE = True
+except OSError:
+    PROC_AVAILABLE = False
+_cpu_jiffies = None  # (busy, total) at the start of the current CPU window
+_cpu_last_percent: Optional[float] = None
+# Shorter windows are mostly rounding noise (about 0.25 s of every CPU)
+_CPU_MIN_JIFFIES = 25 * (os.cpu_count() or 1)
+
+
+class ConnectionManager:
+    """Fan status frames out to connected WebSocket clients"""
+    
+    def __init__(self):
+        # One single-slot queue per client, so a slow reader never holds up
+        # the others and only ever has the newest frame waiting
+        self.queues: Set[asyncio.Queue] = set()
+    
+    def connect(self) -> asyncio.Queue:
+        """Register a client and return the queue its frames arrive on"""
+        queue = asyncio.Queue(maxsize=1)
+        self.queues.add(queue)
+        return queue
+    
+    def disconnect(self, queue: asyncio.Queue):
+        """Unregister a client"""
+        self.queues.discard(queue)
+    
+    def broadcast(self, frames: Tuple[int, Union[str, bytes], Optional[Union[str, bytes]]]):
+        """Queue a (seq, full, patch) frame set for every client, replacing any unsent one"""
+        for queue in self.queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(frames)
 
 # Global state (will be initialized on startup)
 context_manager: Optional[ContextManager] = None
 timeseries_db: Optional[TimeSeriesDB] = None
 trigger_monitor: Optional[TriggerMonitor] = None
 
+# Status is collected once per interval by a background task and shared
+# by every HTTP request and WebSocket client. CPU, memory and load are
+# sampled every STATUS_REFRESH_SECONDS; disk usage and failed units change
+# on the scale of minutes and are refreshed by a slower task.
+STATUS_REFRESH_SECONDS = 5
+SLOW_REFRESH_SECONDS = 30
+_last_status: Optional[Dict[str, Any]] = None
+# (seq, full frame, patch frame) of the last refresh. The patch turns
+# status seq - 1 into seq; every FULL_FRAME_EVERY ticks it is None so all
+# clients resync from a full frame.
+_last_frames: Optional[Tuple[int, Union[str, bytes], Optional[Union[str, bytes]]]] = None
+FULL_FRAME_EVERY = 12
+# Quiet ticks are not pushed: a push needs a state change or a metric
+# moving this far since the last push, or HEARTBEAT_SECONDS without one
+PUSH_PERCENT_DELTA = 2.0
+PUSH_LOAD_DELTA = 0.1
+HEARTBEAT_SECONDS = 30
+_slow_status: Optional[Dict[str, Any]] = None  # Disk usage and failed units
+connections = ConnectionManager()
+WS_SEND_TIMEOUT = 10  # Seconds before a client that stopped reading is dropped
+_status_task: Optional[asyncio.Task] = None
+_slow_task: Optional[asyncio.Task] = None
+_systemd_manager = None  # systemd1 Manager DBus proxy; False once DBus has failed
+
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize components on startup"""
-    global context_manager, timeseries_db, trigger_monitor
+    global context_manager, timeseries_db, trigger_monitor, _status_task, _slow_task
+    
+    # Prime CPU sampling so status refreshes can read it without sleeping
+    if PROC_AVAILABLE:
+        _proc_cpu_percent()
+    else:
+        psutil.cpu_percent(interval=None)
+    _slow_task = asyncio.create_task(_slow_refresher())
+    _status_task = asyncio.create_task(_status_refresher())
     
     try:
         context_manager = ContextManager()
@@ -52,49 +209,178 @@ async def startup_event():
         print(f"Warning: Could not initialize all components: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks"""
+    for task in (_status_task, _slow_task):
+        if task:
+            task.cancel()
+
+
 @app.get("/")
-async def root():
-    """Serve main page"""
-    return HTMLResponse(content=get_index_html(), media_type="text/html")
+async def root(request: Request):
+    """Serve main page, gzipped when the client accepts it"""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        body, etag, headers = _INDEX_GZ, _INDEX_GZ_ETAG, _INDEX_GZ_HEADERS
+    else:
+        body, etag, headers = _INDEX_BYTES, _INDEX_ETAG, _INDEX_HEADERS
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html", headers=headers)
 
 
-@app.get("/api/status")
-async def get_status() -> Dict[str, Any]:
-    """Get current system status"""
-    import socket
-    hostname = socket.gethostname()
+def _proc_cpu_percent() -> float:
+    """
+    Get system-wide CPU usage since the previous call from /proc/stat
+    
+    A call too soon after the previous one keeps the window open and returns
+    the last value, or the average since boot before there is one.
+    """
+    global _cpu_jiffies, _cpu_last_percent
+    
+    # Aggregate line: cpu user nice system idle iowait irq softirq steal ...
+    # (guest time is already counted in user and nice)
+    line = os.pread(_PROC_STAT_FD, 256, 0).split(b'\n', 1)[0]
+    jiffies = [int(value) for value in line.split()[1:9]]
+    total = sum(jiffies)
+    busy = total - jiffies[3] - jiffies[4]
+    
+    if _cpu_jiffies is None:
+        _cpu_jiffies = (busy, total)
+    elif total - _cpu_jiffies[1] >= _CPU_MIN_JIFFIES:
+        previous, _cpu_jiffies = _cpu_jiffies, (busy, total)
+        _cpu_last_percent = round(max(0.0, (busy - previous[0]) / (total - previous[1]) * 100), 1)
+    
+    if _cpu_last_percent is None:
+        return round(busy / total * 100, 1)
+    return _cpu_last_percent
+
+
+def _proc_memory() -> Tuple[float, int]:
+    """Get (percent used, bytes available) from /proc/meminfo"""
+    # MemTotal, MemFree and MemAvailable are the first three lines
+    lines = os.pread(_PROC_MEMINFO_FD, 256, 0).split(b'\n', 3)
+    total = int(lines[0].split()[1])
+    available = int(lines[2].split()[1])
+    return round((total - available) / total * 100, 1), available * 1024
+
+
+def _collect_metrics(slow: Dict[str, Any]) -> Dict[str, Any]:
+    """Read the fast-moving system metrics and merge in the slow ones"""
+    # CPU usage is since the previous call; primed at startup
+    if PROC_AVAILABLE:
+        cpu_percent = _proc_cpu_percent()
+        memory_percent, memory_available = _proc_memory()
+    else:
+        cpu_percent = psutil.cpu_percent(interval=None)
+        memory = psutil.virtual_memory()
+        memory_percent, memory_available = memory.percent, memory.available
+    load_avg = os.getloadavg()
+    
+    return {
+        "cpu_percent": cpu_percent,
+        "memory_percent": memory_percent,
+        "memory_available_gb": memory_available / (1024**3),
+        "disk_percent": slow["disk_percent"],
+        "disk_free_gb": slow["disk_free_gb"],
+        "load_average": {
+            "1min": load_avg[0],
+            "5min": load_avg[1],
+            "15min": load_avg[2]
+        }
+    }
 
-    # Get basic metrics
-    cpu_percent = psutil.cpu_percent(interval=0.5)
-    memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
-    load_avg = psutil.getloadavg()
+
+def _list_failed_units_dbus() -> List[str]:
+    """Get names of failed units from systemd over DBus (blocking)"""
+    global _systemd_manager
+    
+    if _systemd_manager is None:
+        _systemd_manager = SystemMessageBus().get_proxy(
+            "org.freedesktop.systemd1", "/org/freedesktop/systemd1"
+        )
+    return [unit[0] for unit in _systemd_manager.ListUnitsFiltered(["failed"])]
+
+
+async def _get_failed_services() -> List[str]:
+    """Get names of failed systemd units"""
+    global _systemd_manager
+    
+    if DASBUS_AVAILABLE and _systemd_manager is not False:
+        try:
+            return await asyncio.to_thread(_list_failed_units_dbus)
+        except Exception as e:
+            print(f"Error querying systemd over DBus, using systemctl: {e}")
+            _systemd_manager = False
     
-    # Get service status
-    import subprocess
     failed_services = []
     try:
-        result = subprocess.run(
-            ["systemctl", "--failed", "--no-legend", "--no-pager"],
-            capture_output=True,
-            text=True,
-            timeout=5
+        proc = await asyncio.create_subprocess_exec(
+            "systemctl", "--failed", "--no-legend", "--no-pager",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
         )
-        if result.returncode == 0:
-            for line in result.stdout.strip().split('\n'):
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=5)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return failed_services
+        
+        if proc.returncode == 0:
+            for line in stdout.decode().strip().split('\n'):
                 if line:
                     service = line.split()[0]
                     failed_services.append(service)
-    except:
+    except Exception:
         pass
     
+    return failed_services
+
+
+async def _collect_slow_status() -> Dict[str, Any]:
+    """Read disk usage and failed units without blocking the event loop"""
+    disk, failed_services = await asyncio.gather(
+        asyncio.to_thread(psutil.disk_usage, '/'),
+        _get_failed_services()
+    )
+    return {
+        "disk_percent": disk.percent,
+        "disk_free_gb": disk.free / (1024**3),
+        "failed_services": failed_services
+    }
+
+
+async def _slow_refresher():
+    """Refresh disk usage and failed units every SLOW_REFRESH_SECONDS"""
+    global _slow_status
+    
+    while True:
+        try:
+            _slow_status = await _collect_slow_status()
+        except Exception as e:
+            print(f"Error refreshing disk and service status: {e}")
+        
+        await asyncio.sleep(SLOW_REFRESH_SECONDS)
+
+
+async def _build_status() -> Dict[str, Any]:
+    """Collect current system status"""
+    # Slow metrics come from the last slow refresh; only the first status
+    # built before that refresh lands has to collect them itself
+    slow = _slow_status or await _collect_slow_status()
+    failed_services = slow["failed_services"]
+    # A handful of /proc reads, cheap enough to run on the loop
+    metrics = _collect_metrics(slow)
+    
     # Overall health score (0-100)
     health_score = 100
-    if cpu_percent > 90:
+    if metrics["cpu_percent"] > 90:
         health_score -= 20
-    if memory.percent > 85:
+    if metrics["memory_percent"] > 85:
         health_score -= 20
-    if disk.percent > 90:
+    if metrics["disk_percent"] > 90:
         health_score -= 30
     if failed_services:
         health_score -= len(failed_services) * 10
@@ -109,26 +395,123 @@ async def get_status() -> Dict[str, Any]:
         status = "critical"
     
     return {
-        "hostname": hostname,
+        "hostname": HOSTNAME,
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "status": status,
         "health_score": health_score,
-        "metrics": {
-            "cpu_percent": cpu_percent,
-            "memory_percent": memory.percent,
-            "memory_available_gb": memory.available / (1024**3),
-            "disk_percent": disk.percent,
-            "disk_free_gb": disk.free / (1024**3),
-            "load_average": {
-                "1min": load_avg[0],
-                "5min": load_avg[1],
-                "15min": load_avg[2]
-            }
-        },
+        "metrics": metrics,
         "failed_services": failed_services
     }
 
 
+def _merge_patch(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the JSON merge patch (RFC 7386) that turns old into new"""
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+            continue
+        previous = old[key]
+        if value == previous:
+            continue
+        if isinstance(value, dict) and isinstance(previous, dict):
+            patch[key] = _merge_patch(previous, value)
+        else:
+            patch[key] = value
+    for key in old.keys() - new.keys():
+        patch[key] = None
+    return patch
+
+
+def _status_changed(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    """Check whether new differs enough from old to be worth pushing"""
+    if (old["status"] != new["status"]
+            or old["health_score"] != new["health_score"]
+            or old["failed_services"] != new["failed_services"]):
+        return True
+    
+    old_metrics, new_metrics = old["metrics"], new["metrics"]
+    for key in ("cpu_percent", "memory_percent", "disk_percent"):
+        if abs(new_metrics[key] - old_metrics[key]) >= PUSH_PERCENT_DELTA:
+            return True
+    return abs(new_metrics["load_average"]["1min"] - old_metrics["load_average"]["1min"]) >= PUSH_LOAD_DELTA
+
+
+async def _status_refresher():
+    """Refresh the shared status snapshot and queue it for WebSocket clients"""
+    global _last_status, _last_frames
+    
+    seq = 0
+    pushed = None  # Last status sent to clients
+    pushed_at = 0.0
+    while True:
+        try:
+            _last_status = await _build_status()
+            
+            now = time.monotonic()
+            if (pushed is None
+                    or now - pushed_at >= HEARTBEAT_SECONDS
+                    or _status_changed(pushed, _last_status)):
+                # Serialize once for all clients: a full snapshot, and a
+                # patch against the last push for clients that received it
+                seq += 1
+                full = _ws_encode({"type": "full", "data": _last_status})
+                patch = None
+                if pushed is not None and seq % FULL_FRAME_EVERY:
+                    patch = _ws_encode({"type": "patch", "data": _merge_patch(pushed, _last_status)})
+                pushed, pushed_at = _last_status, now
+                _last_frames = (seq, full, patch)
+                connections.broadcast(_last_frames)
+        except Exception as e:
+            print(f"Error refreshing status: {e}")
+        
+        await asyncio.sleep(STATUS_REFRESH_SECONDS)
+
+
+@app.get("/api/status")
+async def get_status() -> Dict[str, Any]:
+    """Get current system status"""
+    if _last_status is None:
+        return await _build_status()
+    return _last_status
+
+
+def _summarize_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a context entry to the fields shown in the activity list"""
+    event = entry.get('event', {})
+    
+    # Extract most useful message, cleaned up if it's too long
+    message = event.get('message') or event.get('summary') or event.get('description') or "System event"
+    if len(message) > 200:
+        message = message[:197] + "..."
+    
+    return {
+        'type': event.get('type', 'unknown'),
+        'message': message,
+        'severity': event.get('severity', 'info'),
+        'timestamp': entry.get('timestamp')
+    }
+
+
+def _recent_events() -> List[Dict[str, Any]]:
+    """Get the last 20 context entries as activity items, newest first"""
+    # Read from the end without copying the whole deque
+    entries = islice(reversed(context_manager.context_entries), 20)
+    event_summary = [_summarize_entry(entry) for entry in entries]
+    return sorted(event_summary, key=itemgetter('timestamp'), reverse=True)
+
+
+def _context_stats() -> Dict[str, Any]:
+    """Get context window usage"""
+    cm = context_manager
+    tokens = cm.current_token_count
+    return {
+        "entries": len(cm.context_entries),
+        "tokens": tokens,
+        "utilization": f"{tokens / cm.context_size * 100:.1f}%"
+    }
+
+
 @app.get("/api/summary")
 async def get_summary() -> Dict[str, Any]:
     """Get AI-generated system summary"""
@@ -138,47 +521,58 @@ async def get_summary() -> Dict[str, Any]:
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
-    # Get recent context
+    # Independent sub-fetches run concurrently, off the event loop
     try:
-        # Summarize recent events
-        entries = list(context_manager.context_entries)[-20:]  # Last 20 events
-        
-        event_summary = []
-        for entry in entries:
-            event = entry.get('event', {})
-            event_type = event.get('type', 'unknown')
-            
-            # Extract most useful message
-            message = event.get('message') or event.get('summary') or event.get('description') or "System event"
-            
-            # Clean up message if it's too long
-            if len(message) > 200:
-                message = message[:197] + "..."
-                
-            event_summary.append({
-                'type': event_type,
-                'message': message,
-                'severity': event.get('severity', 'info'),
-                'timestamp': entry.get('timestamp')
-            })
+        async with asyncio.TaskGroup() as tg:
+            events_task = tg.create_task(asyncio.to_thread(_recent_events))
+            stats_task = tg.create_task(asyncio.to_thread(_context_stats))
         
         return {
             "summary": "System operational. Recent activity tracked.",
-            "recent_events": sorted(event_summary, key=lambda x: x['timestamp'], reverse=True),
-            "context_stats": {
-                "entries": len(context_manager.context_entries),
-                "tokens": context_manager.current_token_count,
-                "utilization": f"{(context_manager.current_token_count / context_manager.context_size * 100):.1f}%"
-            },
+            "recent_events": events_task.result(),
+            "context_stats": stats_task.result(),
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     except Exception as e:
+        if isinstance(e, ExceptionGroup):
+            e = e.exceptions[0]
         return {
             "summary": f"Error generating summary: {e}",
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
 
+def tail_jsonl(path: Path, n: int) -> List[Dict[str, Any]]:
+    """
+    Parse the last n lines of a JSONL file, newest first
+    
+    Maps the file and scans backwards for newlines, so the cost depends
+    on n rather than the size of the file and the hot tail is served
+    straight from the page cache. Lines that are not valid JSON are
+    skipped.
+    """
+    if n <= 0:
+        return []
+    
+    entries = []
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while end > 0 and len(entries) < n:
+                start = mm.rfind(b'\n', 0, end) + 1
+                line = mm[start:end]
+                end = start - 1
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(_json_loads(line))
+                except json.JSONDecodeError:
+                    pass
+    return entries
+
+
 @app.get("/api/decisions")
 async def get_decisions(limit: int = 5) -> Dict[str, Any]:
     """Get latest AI decisions directly from the log file"""
@@ -188,16 +582,8 @@ async def get_decisions(limit: int = 5) -> Dict[str, Any]:
     
     if log_path.exists():
         try:
-            # Read last N lines
-            with open(log_path, 'r') as f:
-                # Simple deque for tailing
-                from collections import deque
-                lines = deque(f, maxlen=limit)
-                for line in reversed(lines): # Newest first
-                    try:
-                        decisions.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        pass
+            # Read last N lines, newest first, off the event loop
+            decisions = await asyncio.to_thread(tail_jsonl, log_path, limit)
             return {"decisions": decisions}
         except Exception as e:
             print(f"Error reading decisions log: {e}")
@@ -213,28 +599,74 @@ async def get_decisions(limit: int = 5) -> Dict[str, Any]:
         return {"error": str(e)}
 
 
+# Recent history responses by period, replayed instead of re-querying
+HISTORY_CACHE_SECONDS = 60
+HISTORY_CACHE_MAX_BYTES = 1024 * 1024  # Longer periods are streamed every time
+HISTORY_CACHE_MAX_ENTRIES = 16
+_history_cache: Dict[int, Tuple[float, str]] = {}  # hours -> (time.monotonic(), NDJSON body)
+
+
+def _cache_history(lines: Iterator[str], hours: int) -> Iterator[str]:
+    """Pass NDJSON lines through, keeping the body if the stream completes and is small"""
+    parts = []
+    size = 0
+    for line in lines:
+        yield line
+        if parts is not None:
+            size += len(line)
+            if size > HISTORY_CACHE_MAX_BYTES:
+                parts = None
+            else:
+                parts.append(line)
+    
+    if parts is not None:
+        now = time.monotonic()
+        for key, (cached_at, _) in list(_history_cache.items()):
+            if now - cached_at >= HISTORY_CACHE_SECONDS:
+                del _history_cache[key]
+        if len(_history_cache) < HISTORY_CACHE_MAX_ENTRIES:
+            _history_cache[hours] = (now, "".join(parts))
+
+
+def _ndjson_lines(first: Optional[Dict[str, Any]], rows: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Serialize rows as newline-delimited JSON"""
+    if first is None:
+        return
+    yield _json_dumps(first) + "\n"
+    for row in rows:
+        yield _json_dumps(row) + "\n"
+
+
 @app.get("/api/metrics/history")
-async def get_metrics_history(hours: int = 24) -> Dict[str, Any]:
-    """Get historical metrics"""
+async def get_metrics_history(hours: int = 24) -> Response:
+    """Stream historical metrics as NDJSON, one time bucket per line, newest first"""
     if not timeseries_db:
         return {"error": "TimescaleDB not available"}
     
-    import socket
-    hostname = socket.gethostname()
+    headers = {"X-Hostname": HOSTNAME, "X-Period-Hours": str(hours)}
+    cached = _history_cache.get(hours)
+    if cached is not None and time.monotonic() - cached[0] < HISTORY_CACHE_SECONDS:
+        return Response(content=cached[1], media_type="application/x-ndjson", headers=headers)
+    
+    rows = timeseries_db.iter_metrics(
+        HOSTNAME,
+        metric_names=['cpu_percent', 'memory_percent', 'disk_percent'],
+        start_time=datetime.now(timezone.utc) - timedelta(hours=hours),
+        interval="5 minutes"
+    )
     try:
-        metrics = timeseries_db.query_metrics(
-            hostname,
-            metric_names=['cpu_percent', 'memory_percent', 'disk_percent'],
-            interval="5 minutes"
-        )
-        
-        return {
-            "hostname": hostname,
-            "period_hours": hours,
-            "metrics": metrics
-        }
+        # Fetch the first row up front so connection and query errors are
+        # still reported as a JSON error rather than a truncated stream
+        first = await asyncio.to_thread(next, rows, None)
     except Exception as e:
         return {"error": str(e)}
+    
+    # Starlette iterates the sync generator in its thread pool
+    return StreamingResponse(
+        _cache_history(_ndjson_lines(first, rows), hours),
+        media_type="application/x-ndjson",
+        headers=headers
+    )
 
 
 @app.get("/api/triggers")
@@ -259,445 +691,47 @@ async def get_triggers() -> Dict[str, Any]:
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket for real-time updates"""
     await websocket.accept()
+    queue = connections.connect()
     
     try:
+        # Send the current status in full, then a patch per refresh; a
+        # client that missed a refresh gets the full frame instead
+        if _last_frames is not None:
+            sent_seq, message, _ = _last_frames
+        else:
+            sent_seq, message = None, _ws_encode({"type": "full", "data": await _build_status()})
+        send = websocket.send_bytes if MSGPACK_AVAILABLE else websocket.send_text
+        next_frames, wait_for = queue.get, asyncio.wait_for
         while True:
-            # Send status update every 5 seconds
-            status = await get_status()
-            await websocket.send_json(status)
-            await asyncio.sleep(5)
+            await wait_for(send(message), timeout=WS_SEND_TIMEOUT)
+            seq, full, patch = await next_frames()
+            message = patch if patch is not None and sent_seq == seq - 1 else full
+            sent_seq = seq
     
     except WebSocketDisconnect:
         print("Client disconnected")
-
-
-def get_index_html() -> str:
-    """Generate HTML for main page"""
-    return """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Sysadmin - System Monitor</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #0f172a;
-            color: #e2e8f0;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-        }
-        
-        header {
-            margin-bottom: 30px;
-            padding-bottom: 20px;
-            border-bottom: 2px solid #1e293b;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
-        h1 {
-            font-size: 2rem;
-            color: #60a5fa;
-        }
-        
-        .status-indicator {
-            display: inline-block;
-            padding: 5px 15px;
-            border-radius: 20px;
-            font-size: 0.9rem;
-            font-weight: 600;
-        }
-        
-        .status-healthy { background: #065f46; color: #d1fae5; }
-        .status-degraded { background: #92400e; color: #fef3c7; }
-        .status-critical { background: #7f1d1d; color: #fecaca; }
-        
-        .grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
-            gap: 20px;
-            margin-bottom: 20px;
-        }
-        
-        .card {
-            background: #1e293b;
-            border-radius: 10px;
-            padding: 20px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
-            border: 1px solid #334155;
-        }
-        
-        .card h2 {
-            font-size: 1.2rem;
-            margin-bottom: 15px;
-            color: #94a3b8;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
-        
-        .metric {
-            margin-bottom: 15px;
-        }
-        
-        .metric-label {
-            font-size: 0.9rem;
-            color: #94a3b8;
-            margin-bottom: 5px;
-        }
-        
-        .metric-value {
-            font-size: 1.5rem;
-            font-weight: 600;
-            color: #60a5fa;
-        }
-        
-        .metric-bar {
-            height: 8px;
-            background: #334155;
-            border-radius: 4px;
-            overflow: hidden;
-            margin-top: 5px;
-        }
-        
-        .metric-bar-fill {
-            height: 100%;
-            background: #60a5fa;
-            transition: width 0.3s ease;
-        }
-        
-        .metric-bar-fill.warning { background: #f59e0b; }
-        .metric-bar-fill.critical { background: #ef4444; }
-        
-        .event-list {
-            list-style: none;
-            max-height: 400px;
-            overflow-y: auto;
-        }
-        
-        .event-item {
-            padding: 12px;
-            margin-bottom: 8px;
-            background: #0f172a;
-            border-radius: 5px;
-            border-left: 4px solid #3b82f6;
-            font-size: 0.95rem;
-        }
-        
-        .event-item.critical { border-left-color: #ef4444; }
-        .event-item.high { border-left-color: #f97316; }
-        .event-item.medium { border-left-color: #f59e0b; }
-        
-        .event-time {
-            font-size: 0.8rem;
-            color: #64748b;
-            margin-top: 4px;
-        }
-
-        .decision-card {
-            background: #1e293b;
-            border-radius: 10px;
-            padding: 20px;
-            border-left: 5px solid #8b5cf6;
-            margin-bottom: 20px;
-        }
-
-        .decision-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 15px;
-        }
-
-        .decision-status {
-            font-weight: bold;
-            text-transform: uppercase;
-            font-size: 0.8rem;
-            padding: 2px 8px;
-            border-radius: 4px;
-        }
-
-        .issue-tag {
-            display: inline-block;
-            padding: 2px 8px;
-            background: #334155;
-            border-radius: 4px;
-            font-size: 0.8rem;
-            margin-right: 5px;
-            margin-bottom: 5px;
-        }
-
-        .issue-high { color: #fca5a5; border: 1px solid #7f1d1d; }
-        .issue-medium { color: #fde68a; border: 1px solid #78350f; }
-
-        .action-box {
-            background: #0f172a;
-            padding: 10px;
-            border-radius: 5px;
-            margin-top: 10px;
-            border: 1px dashed #4b5563;
-        }
-        
-        .loading {
-            text-align: center;
-            padding: 40px;
-            color: #64748b;
-        }
-        
-        footer {
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 2px solid #1e293b;
-            text-align: center;
-            color: #64748b;
-            font-size: 0.9rem;
-        }
-
-        ::-webkit-scrollbar {
-            width: 8px;
-        }
-        ::-webkit-scrollbar-track {
-            background: #1e293b;
-        }
-        ::-webkit-scrollbar-thumb {
-            background: #334155;
-            border-radius: 4px;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <div>
-                <h1>🤖 Brighid AI Sysadmin</h1>
-                <div style="margin-top: 5px;">
-                    <span id="hostname" style="color: #94a3b8;">-</span> | 
-                    <span id="update-time" style="color: #64748b;">-</span>
-                </div>
-            </div>
-            <div id="status-badge" class="status-indicator">CONNECTING...</div>
-        </header>
-
-        <div id="ai-analysis-container">
-            <!-- Latest AI Decision will be injected here -->
-            <div class="card loading">Waiting for AI Analysis...</div>
-        </div>
-        
-        <div class="grid">
-            <div class="card">
-                <h2>📊 System Metrics</h2>
-                <div class="metric">
-                    <div class="metric-label">CPU Usage</div>
-                    <div class="metric-value" id="cpu-value">-</div>
-                    <div class="metric-bar">
-                        <div class="metric-bar-fill" id="cpu-bar" style="width: 0%"></div>
-                    </div>
-                </div>
-                <div class="metric">
-                    <div class="metric-label">Memory Usage</div>
-                    <div class="metric-value" id="memory-value">-</div>
-                    <div class="metric-bar">
-                        <div class="metric-bar-fill" id="memory-bar" style="width: 0%"></div>
-                    </div>
-                </div>
-                <div class="metric">
-                    <div class="metric-label">Disk Usage</div>
-                    <div class="metric-value" id="disk-value">-</div>
-                    <div class="metric-bar">
-                        <div class="metric-bar-fill" id="disk-bar" style="width: 0%"></div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="card">
-                <h2>🏥 System Health</h2>
-                <div class="metric">
-                    <div class="metric-label">Health Score</div>
-                    <div class="metric-value" id="health-score">-</div>
-                </div>
-                <div class="metric">
-                    <div class="metric-label">Load Average (1m)</div>
-                    <div class="metric-value" id="load-avg">-</div>
-                </div>
-                <div class="metric">
-                    <div class="metric-label">Failed Services</div>
-                    <div class="metric-value" id="failed-services">-</div>
-                </div>
-            </div>
-            
-            <div class="card" style="grid-column: span 2;">
-                <h2>🔔 Recent Activity</h2>
-                <ul class="event-list" id="event-list">
-                    <li class="loading">Loading events...</li>
-                </ul>
-            </div>
-        </div>
-        
-        <footer>
-            Brighid AI Sysadmin - Autonomous monitoring and maintenance
-        </footer>
-    </div>
-    
-    <script>
-        let ws = null;
-        
-        function updateUI(data) {
-            // Status badge
-            const statusBadge = document.getElementById('status-badge');
-            statusBadge.textContent = data.status.toUpperCase();
-            statusBadge.className = 'status-indicator status-' + data.status;
-            
-            // Header info
-            document.getElementById('hostname').textContent = data.hostname;
-            document.getElementById('update-time').textContent = new Date().toLocaleTimeString();
-            
-            // Metrics
-            const metrics = data.metrics;
-            
-            updateMetric('cpu', metrics.cpu_percent);
-            updateMetric('memory', metrics.memory_percent);
-            updateMetric('disk', metrics.disk_percent);
-            
-            document.getElementById('health-score').textContent = data.health_score + '/100';
-            document.getElementById('load-avg').textContent = metrics.load_average['1min'].toFixed(2);
-            document.getElementById('failed-services').textContent = data.failed_services.length;
-        }
-        
-        function updateMetric(name, percent) {
-            const valueEl = document.getElementById(name + '-value');
-            const barEl = document.getElementById(name + '-bar');
-            
-            valueEl.textContent = percent.toFixed(1) + '%';
-            barEl.style.width = percent + '%';
-            
-            // Color based on threshold
-            barEl.className = 'metric-bar-fill';
-            if (percent > 90) {
-                barEl.classList.add('critical');
-            } else if (percent > 75) {
-                barEl.classList.add('warning');
-            }
-        }
-        
-        async function fetchSummary() {
-            try {
-                const response = await fetch('/api/summary');
-                const data = await response.json();
-                
-                const eventList = document.getElementById('event-list');
-                eventList.innerHTML = '';
-                
-                if (data.recent_events && data.recent_events.length > 0) {
-                    data.recent_events.forEach(event => {
-                        const li = document.createElement('li');
-                        li.className = 'event-item ' + (event.severity || 'info');
-                        li.innerHTML = `
-                            <div style="font-weight: 500;">${event.message}</div>
-                            <div class="event-time">${new Date(event.timestamp).toLocaleString()} • ${event.type}</div>
-                        `;
-                        eventList.appendChild(li);
-                    });
-                } else {
-                    eventList.innerHTML = '<li class="loading">No recent activity</li>';
-                }
-            } catch (error) {
-                console.error('Error fetching summary:', error);
-            }
-        }
-
-        async function fetchDecisions() {
-            try {
-                const response = await fetch('/api/decisions?limit=1');
-                const data = await response.json();
-                
-                const container = document.getElementById('ai-analysis-container');
-                
-                if (data.decisions && data.decisions.length > 0) {
-                    const decision = data.decisions[0];
-                    const analysis = decision.analysis;
-                    
-                    let issuesHtml = '';
-                    if (analysis.issues && analysis.issues.length > 0) {
-                        issuesHtml = analysis.issues.map(issue => 
-                            `<span class="issue-tag issue-${issue.severity}">${issue.severity.toUpperCase()}: ${issue.description}</span>`
-                        ).join('');
-                    }
-
-                    container.innerHTML = `
-                        <div class="decision-card">
-                            <div class="decision-header">
-                                <div>
-                                    <h2 style="color: #a78bfa; margin-bottom: 5px;">🧠 Latest AI Analysis</h2>
-                                    <div class="event-time">Generated at ${new Date(decision.timestamp).toLocaleString()}</div>
-                                </div>
-                                <span class="status-indicator status-${analysis.status}">${analysis.status.toUpperCase()}</span>
-                            </div>
-                            
-                            <p style="margin-bottom: 15px; line-height: 1.5;">${analysis.summary}</p>
-                            
-                            <div style="margin-bottom: 15px;">
-                                ${issuesHtml}
-                            </div>
-                            
-                            <div class="action-box">
-                                <strong style="color: #60a5fa; font-size: 0.9rem;">RECOMENDED ACTIONS:</strong>
-                                <p style="margin-top: 5px; font-size: 0.95rem;">${decision.action.proposed_action || 'No immediate actions required.'}</p>
-                            </div>
-                        </div>
-                    `;
-                }
-            } catch (error) {
-                console.error('Error fetching decisions:', error);
-            }
-        }
-        
-        function connectWebSocket() {
-            const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-            ws = new WebSocket(protocol + '//' + window.location.host + '/ws');
-            
-            ws.onmessage = function(event) {
-                const data = JSON.parse(event.data);
-                updateUI(data);
-            };
-            
-            ws.onclose = function() {
-                console.log('WebSocket closed, reconnecting in 5s...');
-                setTimeout(connectWebSocket, 5000);
-            };
-            
-            ws.onerror = function(error) {
-                console.error('WebSocket error:', error);
-            };
-        }
-        
-        // Initialize
-        connectWebSocket();
-        fetchSummary();
-        fetchDecisions();
-        setInterval(fetchSummary, 15000);  // Update summary every 15s
-        setInterval(fetchDecisions, 600000); // Update AI analysis every 10m
-    </script>
-</body>
-</html>
-    """
+    except asyncio.TimeoutError:
+        print("Client stopped reading, closing")
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+    finally:
+        connections.disconnect(queue)
 
 
 if __name__ == "__main__":
-    import uvicorn
-    import os
     port = int(os.environ.get("PORT", 40084))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # A single process: the status cache and WebSocket queues live in memory.
+    # uvloop and httptools are picked up when installed, asyncio/h11 otherwise.
+    # Status frames are small, pre-encoded once and mostly patches, so
+    # per-connection permessage-deflate would only recompress them per client.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        ws_per_message_deflate=False,
+    )
 